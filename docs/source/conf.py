@@ -5,18 +5,20 @@
 
 # -- Project information -----------------------------------------------------
 # https://www.sphinx-doc.org/en/master/usage/configuration.html#project-information
+import functools
 import re
 import pathlib
 import sys
 
 sys.path.insert(0, str(pathlib.Path(__file__).parents[2] / "src"))
 
+_VERSION_RE = re.compile(r"__VERSION__ = \"(.*?)\"")
 
+
+@functools.lru_cache(maxsize=1)
 def get_version() -> str:
     version_string_path = pathlib.Path(__file__).parents[2] / "src/flexrag/utils.py"
-    with open(version_string_path, encoding="utf-8") as f:
-        version = re.search(r"__VERSION__ = \"(.*?)\"", f.read()).group(1)
-    return version
+    return _VERSION_RE.search(version_string_path.read_text(encoding="utf-8")).group(1)
 
 
 project = "FlexRAG Documentation"
@@ -1,6 +1,7 @@
 import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 from flexrag.common_dataclass import RetrievedContext
@@ -41,6 +42,20 @@ class SearchHistory:
 ASSISTANTS = Register[AssistantBase]("assistant")
 
 
+@lru_cache(maxsize=None)
+def load_prompt(path: str) -> ChatPrompt:
+    """Load a ChatPrompt from a JSON file, caching the parsed result so that
+    repeated assistant construction does not re-read and re-parse the file.
+    The returned prompt is shared, thus the caller should not mutate it directly.
+
+    :param path: The path to the prompt file.
+    :type path: str
+    :return: The loaded ChatPrompt.
+    :rtype: ChatPrompt
+    """
+    return ChatPrompt.from_json(path)
+
+
 PREDEFINED_PROMPTS = {
     "shortform_with_context": ChatPrompt.from_json(
         os.path.join(
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from dataclasses import dataclass
 from typing import Optional
 
@@ -6,7 +5,7 @@ from flexrag.models import GENERATORS, GenerationConfig, GeneratorConfig
 from flexrag.prompt import ChatPrompt, ChatTurn
 from flexrag.utils import LOGGER_MANAGER
 
-from .assistant import ASSISTANTS, AssistantBase
+from .assistant import ASSISTANTS, AssistantBase, load_prompt
 
 logger = LOGGER_MANAGER.get_logger("flexrag.assistant")
 
@@ -41,11 +40,11 @@ class BasicAssistant(AssistantBase):
 
         # load prompts
         if cfg.prompt_path is not None:
-            self.prompt = ChatPrompt.from_json(cfg.prompt_path)
+            self.prompt = load_prompt(cfg.prompt_path)
         else:
             self.prompt = ChatPrompt()
         if cfg.use_history:
-            self.history_prompt = deepcopy(self.prompt)
+            self.history_prompt = self.prompt.copy()
         else:
             self.history_prompt = None
         return
@@ -53,9 +52,9 @@ class BasicAssistant(AssistantBase):
     def answer(self, question: str) -> tuple[str, None, dict[str, ChatPrompt]]:
         # prepare system prompt
         if self.history_prompt is not None:
-            prompt = deepcopy(self.history_prompt)
+            prompt = self.history_prompt.copy()
         else:
-            prompt = deepcopy(self.prompt)
+            prompt = self.prompt.copy()
 
         prompt.update(ChatTurn(role="user", content=question))
 
@@ -70,5 +69,5 @@ class BasicAssistant(AssistantBase):
 
     def clear_history(self) -> None:
         if self.history_prompt is not None:
-            self.history_prompt = deepcopy(self.prompt)
+            self.history_prompt = self.prompt.copy()
         return
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
@@ -10,7 +9,13 @@ from flexrag.ranker import RANKERS, RankerConfig
 from flexrag.retriever import RETRIEVERS, RetrieverConfig
 from flexrag.utils import LOGGER_MANAGER, Choices
 
-from .assistant import ASSISTANTS, PREDEFINED_PROMPTS, AssistantBase, SearchHistory
+from .assistant import (
+    ASSISTANTS,
+    PREDEFINED_PROMPTS,
+    AssistantBase,
+    SearchHistory,
+    load_prompt,
+)
 
 logger = LOGGER_MANAGER.get_logger("flexrag.assistant.modular")
 
@@ -75,12 +80,8 @@ class ModularAssistant(AssistantBase):
                 self.prompt_with_ctx = ChatPrompt()
                 self.prompt_wo_ctx = ChatPrompt()
             case "custom":
-                self.prompt_with_ctx = ChatPrompt.from_json(
-                    cfg.prompt_with_context_path
-                )
-                self.prompt_wo_ctx = ChatPrompt.from_json(
-                    cfg.prompt_without_context_path
-                )
+                self.prompt_with_ctx = load_prompt(cfg.prompt_with_context_path)
+                self.prompt_wo_ctx = load_prompt(cfg.prompt_without_context_path)
             case _:
                 raise ValueError(f"Invalid response type: {cfg.response_type}")
         return
@@ -126,25 +127,30 @@ class ModularAssistant(AssistantBase):
     ) -> tuple[str, ChatPrompt]:
         # prepare system prompts
         if len(contexts) > 0:
-            prompt = deepcopy(self.prompt_with_ctx)
+            prompt = self.prompt_with_ctx.copy()
         else:
-            prompt = deepcopy(self.prompt_wo_ctx)
+            prompt = self.prompt_wo_ctx.copy()
 
         # prepare user prompt
-        usr_prompt = ""
+        # collect the fragments and join them once, as repeated `+=` on a
+        # string is quadratic in the total context length
+        fragments = []
         for n, context in enumerate(contexts):
             if len(self.used_fields) == 0:
-                ctx = ""
-                for field_name, field_value in context.data.items():
-                    ctx += f"{field_name}: {field_value}\n"
+                ctx = "".join(
+                    f"{field_name}: {field_value}\n"
+                    for field_name, field_value in context.data.items()
+                )
             elif len(self.used_fields) == 1:
                 ctx = context.data[self.used_fields[0]]
             else:
-                ctx = ""
-                for field_name in self.used_fields:
-                    ctx += f"{field_name}: {context.data[field_name]}\n"
-            usr_prompt += f"Context {n + 1}: {ctx}\n\n"
-        usr_prompt += f"Question: {question}"
+                ctx = "".join(
+                    f"{field_name}: {context.data[field_name]}\n"
+                    for field_name in self.used_fields
+                )
+            fragments.append(f"Context {n + 1}: {ctx}\n\n")
+        fragments.append(f"Question: {question}")
+        usr_prompt = "".join(fragments)
         prompt.update(ChatTurn(role="user", content=usr_prompt))
 
         # generate response
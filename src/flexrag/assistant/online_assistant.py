@@ -1,5 +1,4 @@
 import os
-from copy import deepcopy
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -11,7 +10,7 @@ from flexrag.models import GenerationConfig
 from flexrag.prompt import ChatPrompt, ChatTurn
 from flexrag.utils import LOGGER_MANAGER, Choices
 
-from .assistant import ASSISTANTS, AssistantBase
+from .assistant import ASSISTANTS, AssistantBase, load_prompt
 
 logger = LOGGER_MANAGER.get_logger("flexrag.assistant")
 
@@ -57,11 +56,11 @@ class JinaDeepSearch(AssistantBase):
     def __init__(self, cfg: JinaDeepSearchConfig):
         # prepare prompts
         if cfg.prompt_path is not None:
-            self.prompt = ChatPrompt.from_json(cfg.prompt_path)
+            self.prompt = load_prompt(cfg.prompt_path)
         else:
             self.prompt = ChatPrompt()
         if cfg.use_history:
-            self.history_prompt = deepcopy(self.prompt)
+            self.history_prompt = self.prompt.copy()
         else:
             self.history_prompt = None
 
@@ -91,12 +90,14 @@ class JinaDeepSearch(AssistantBase):
         if self.history_prompt is not None:
             prompt = self.history_prompt
         else:
-            prompt = deepcopy(self.prompt)
+            prompt = self.prompt.copy()
 
         prompt.update(ChatTurn(role="user", content=question))
 
         # prepare data
-        data = deepcopy(self.data_template)
+        # the template only holds scalars and the reassigned "messages" slot,
+        # so a shallow copy is sufficient
+        data = self.data_template.copy()
         data["messages"] = prompt.to_list()
 
         # generate response
@@ -109,7 +110,7 @@ class JinaDeepSearch(AssistantBase):
         return response, None, {"prompt": prompt}
 
     def clear_history(self) -> None:
-        self.history_prompt = deepcopy(self.prompt)
+        self.history_prompt = self.prompt.copy()
         return
 
 
@@ -157,11 +158,11 @@ class PerplexityAssistant(AssistantBase):
     def __init__(self, cfg: PerplexityAssistantConfig):
         # load prompts
         if cfg.prompt_path is not None:
-            self.prompt = ChatPrompt.from_json(cfg.prompt_path)
+            self.prompt = load_prompt(cfg.prompt_path)
         else:
             self.prompt = ChatPrompt()
         if cfg.use_history:
-            self.history_prompt = deepcopy(self.prompt)
+            self.history_prompt = self.prompt.copy()
         else:
             self.history_prompt = None
 
@@ -201,12 +202,14 @@ class PerplexityAssistant(AssistantBase):
         if self.history_prompt is not None:
             prompt = self.history_prompt
         else:
-            prompt = deepcopy(self.prompt)
+            prompt = self.prompt.copy()
 
         prompt.update(ChatTurn(role="user", content=question))
 
         # prepare data
-        data = deepcopy(self.data_template)
+        # the template only holds scalars and the reassigned "messages" slot,
+        # so a shallow copy is sufficient
+        data = self.data_template.copy()
         data["messages"] = prompt.to_list()
 
         # generate response
@@ -223,5 +226,5 @@ class PerplexityAssistant(AssistantBase):
         return r, contexts, {"prompt": prompt}
 
     def clear_history(self) -> None:
-        self.history_prompt = deepcopy(self.prompt)
+        self.history_prompt = self.prompt.copy()
         return
@@ -2,7 +2,7 @@ import atexit
 import os
 from collections import OrderedDict
 from dataclasses import dataclass
-from typing import MutableMapping
+from typing import MutableMapping, Optional
 
 import lmdb
 from omegaconf import MISSING
@@ -57,6 +57,29 @@ class StorageBackendBase(MutableMapping[bytes, bytes]):
     def __repr__(self) -> str:
         f"{self.__class__.__name__}(len={len(self)})"
 
+    def get_many(self, keys: list[bytes]) -> list[Optional[bytes]]:
+        """Fetch multiple keys at once, returning None for missing keys.
+        Backends may override this method to batch the lookups.
+
+        :param keys: The keys to fetch.
+        :type keys: list[bytes]
+        :return: The stored values, with None for missing keys.
+        :rtype: list[Optional[bytes]]
+        """
+        return [self.get(key) for key in keys]
+
+    def put_many(self, items: list[tuple[bytes, bytes]]) -> None:
+        """Store multiple key-value pairs at once.
+        Backends may override this method to batch the writes.
+
+        :param items: The key-value pairs to store.
+        :type items: list[tuple[bytes, bytes]]
+        :return: None
+        """
+        for key, value in items:
+            self[key] = value
+        return
+
 
 STORAGEBACKENDS = Register[StorageBackendBase]("storage_backend")
 
@@ -105,6 +128,19 @@ class LMDBBackend(StorageBackendBase):
                 yield key
         return
 
+    def get_many(self, keys: list[bytes]) -> list[Optional[bytes]]:
+        # fetch all keys within a single read transaction
+        with self.database.begin() as txn:
+            return [txn.get(key) for key in keys]
+
+    def put_many(self, items: list[tuple[bytes, bytes]]) -> None:
+        # write all pairs within a single transaction to pay the commit
+        # cost once instead of once per item
+        with self.database.begin(write=True) as txn:
+            with txn.cursor() as cursor:
+                cursor.putmulti(items)
+        return
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(db_path={self.db_path}, len={len(self)})"
 
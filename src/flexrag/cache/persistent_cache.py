@@ -56,6 +56,38 @@ class PersistentCacheBase(MutableMapping):
             f"{repr(self.backend)}"
         )
 
+    def get_many(self, keys: list[Any], default: Any = None) -> list[Any]:
+        """Fetch multiple keys in one backend roundtrip.
+
+        :param keys: The keys to fetch.
+        :type keys: list[Any]
+        :param default: The value returned for missing keys. Default is None.
+        :type default: Any
+        :return: The cached values, with `default` for missing keys.
+        :rtype: list[Any]
+        """
+        hashed_keys = [self.hash_key(key) for key in keys]
+        data = self.backend.get_many(hashed_keys)
+        return [
+            default if d is None else self.serializer.deserialize(d)[1] for d in data
+        ]
+
+    def put_many(self, items: list[tuple[Any, Any]]) -> None:
+        """Store multiple key-value pairs in one backend roundtrip.
+
+        :param items: The key-value pairs to store.
+        :type items: list[tuple[Any, Any]]
+        :return: None
+        """
+        self.backend.put_many(
+            [
+                (self.hash_key(key), self.serializer.serialize((key, value)))
+                for key, value in items
+            ]
+        )
+        self.reduce_size()
+        return
+
     def cache(self, func: callable) -> callable:
         def tupled_args(*args, **kwargs):
             """Return a cache key for the specified hashable arguments."""
@@ -138,6 +170,18 @@ class LRUPersistentCache(PersistentCacheBase):
         self.order.move_to_end(self.hash_key(key))
         return super().__getitem__(key)
 
+    def get_many(self, keys: list[Any], default: Any = None) -> list[Any]:
+        values = super().get_many(keys, default)
+        for key, value in zip(keys, values):
+            if value is not default:
+                self.order.move_to_end(self.hash_key(key))
+        return values
+
+    def put_many(self, items: list[tuple[Any, Any]]) -> None:
+        for key, _ in items:
+            self.order[self.hash_key(key)] = None
+        return super().put_many(items)
+
     def __setitem__(self, key, value) -> None:
         self.order[self.hash_key(key)] = None
         return super().__setitem__(key, value)
@@ -179,6 +223,18 @@ class LFUPersistentCache(PersistentCacheBase):
             self.counter[self.hash_key(key)] -= 1
         return super().__getitem__(key)
 
+    def get_many(self, keys: list[Any], default: Any = None) -> list[Any]:
+        values = super().get_many(keys, default)
+        for key, value in zip(keys, values):
+            if value is not default:
+                self.counter[self.hash_key(key)] -= 1
+        return values
+
+    def put_many(self, items: list[tuple[Any, Any]]) -> None:
+        for key, _ in items:
+            self.counter[self.hash_key(key)] = -1
+        return super().put_many(items)
+
     def __setitem__(self, key, value) -> None:
         hashed_key = self.hash_key(key)
         if hashed_key not in self.backend:
@@ -227,6 +283,11 @@ class FIFOPersistentCache(PersistentCacheBase):
         del self.order[self.hash_key(key)]
         return super().__delitem__(key)
 
+    def put_many(self, items: list[tuple[Any, Any]]) -> None:
+        for key, _ in items:
+            self.order[self.hash_key(key)] = None
+        return super().put_many(items)
+
     def popitem(self) -> tuple:
         if len(self) == 0:
             raise KeyError("popitem(): cache is empty")
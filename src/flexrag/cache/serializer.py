@@ -3,7 +3,7 @@ import pickle
 from abc import ABC, abstractmethod
 from typing import Any
 
-from flexrag.utils import Register
+from flexrag.utils import Register, json_dumps
 
 
 class SerializerBase(ABC):
@@ -53,7 +53,7 @@ class CloudPickleSerializer(SerializerBase):
 @SERIALIZERS("json")
 class JsonSerializer(SerializerBase):
     def serialize(self, obj: Any) -> bytes:
-        return json.dumps(obj).encode("utf-8")
+        return json_dumps(obj).encode("utf-8")
 
     def deserialize(self, data: bytes) -> Any:
         return json.loads(data.decode("utf-8"))
@@ -4,7 +4,7 @@ from typing import Optional
 from omegaconf import MISSING
 
 
-@dataclass
+@dataclass(slots=True)
 class Context:
     """The dataclass for retrieved context.
 
@@ -32,7 +32,7 @@ class Context:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RetrievedContext(Context):
     """The dataclass for retrieved context.
 
@@ -49,8 +49,10 @@ class RetrievedContext(Context):
     score: float = 0.0
 
     def to_dict(self):
+        # NOTE: zero-argument super() cannot be used here, as dataclass
+        # slots=True replaces the class object and breaks the __class__ cell
         return {
-            **super().to_dict(),
+            **Context.to_dict(self),
             "retriever": self.retriever,
             "query": self.query,
             "score": self.score,
@@ -14,6 +14,9 @@ from flexrag.utils import TIME_METER
 
 from .refiner import REFINERS, RefinerBase
 
+# compiled once as the splitter runs on every refined context
+_SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
 
 @dataclass
 class AbstractiveSummarizerConfig(GeneratorConfig):
@@ -140,7 +143,7 @@ class AbstractiveSummarizer(RefinerBase):
         if self.chat_prompt is not None:
             input_prompts = []
             for text in input_texts:
-                prompt = deepcopy(self.chat_prompt)
+                prompt = self.chat_prompt.copy()
                 prompt.update(ChatTurn(role="user", content=text))
                 input_prompts.append(prompt)
             summaries = [i[0] for i in self.model.chat(input_prompts)]
@@ -225,7 +228,11 @@ class RecompExtractiveSummarizer(RefinerBase):
 
         # cut the texts into sentences
         sent_lists = [
-            [i.strip() for i in re.split(r"(?<=[.!?])\s+", t) if len(i.strip()) > 5]
+            [
+                i.strip()
+                for i in _SENTENCE_SPLIT_PATTERN.split(t)
+                if len(i.strip()) > 5
+            ]
             for t in contents
         ]
 
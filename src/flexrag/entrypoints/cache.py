@@ -1,4 +1,3 @@
-import json
 from dataclasses import dataclass
 
 import hydra
@@ -6,7 +5,7 @@ from hydra.core.config_store import ConfigStore
 from omegaconf import MISSING
 
 from flexrag.retriever.retriever_base import RETRIEVAL_CACHE
-from flexrag.utils import Choices
+from flexrag.utils import Choices, json_dumps
 
 
 @dataclass
@@ -28,7 +27,7 @@ def main(config: Config):
             with open(config.export_path, "w", encoding="utf-8") as f:
                 for data in RETRIEVAL_CACHE:
                     data["retrieved_contexts"] = RETRIEVAL_CACHE[data]
-                    f.write(json.dumps(data) + "\n")
+                    f.write(json_dumps(data) + "\n")
         case _:
             raise ValueError("No action specified")
     return
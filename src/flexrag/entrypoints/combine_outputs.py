@@ -7,7 +7,7 @@ from hydra.core.config_store import ConfigStore
 from omegaconf import MISSING, OmegaConf
 
 from flexrag.metrics import Evaluator
-from flexrag.utils import LOGGER_MANAGER
+from flexrag.utils import LOGGER_MANAGER, json_dump
 
 
 @dataclass
@@ -70,7 +70,7 @@ def main(cfg: Config):
         log=True,
     )
     with open(output_eval_score_path, "w", encoding="utf-8") as f:
-        json.dump(
+        json_dump(
             {
                 "eval_scores": resp_score,
                 "eval_details": resp_score_detail,
@@ -1,4 +1,3 @@
-import json
 from dataclasses import dataclass
 from typing import Optional
 
@@ -8,7 +7,7 @@ from omegaconf import OmegaConf
 
 from flexrag.datasets import LineDelimitedDataset, LineDelimitedDatasetConfig
 from flexrag.metrics import Evaluator, EvaluatorConfig
-from flexrag.utils import LOGGER_MANAGER
+from flexrag.utils import LOGGER_MANAGER, json_dump
 
 
 @dataclass
@@ -49,7 +48,7 @@ def main(config: Config):
     )
     if config.output_path is not None:
         with open(config.output_path, "w", encoding="utf-8") as f:
-            json.dump(
+            json_dump(
                 {
                     "eval_scores": resp_score,
                     "eval_details": resp_score_detail,
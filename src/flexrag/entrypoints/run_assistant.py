@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import sys
@@ -13,7 +12,12 @@ from flexrag.assistant import ASSISTANTS
 from flexrag.common_dataclass import RetrievedContext
 from flexrag.datasets import RAGEvalDataset, RAGEvalDatasetConfig
 from flexrag.metrics import Evaluator, EvaluatorConfig
-from flexrag.utils import LOGGER_MANAGER, SimpleProgressLogger, load_user_module
+from flexrag.utils import (
+    LOGGER_MANAGER,
+    SimpleProgressLogger,
+    json_dump,
+    load_user_module,
+)
 
 # load user modules before loading config
 for arg in sys.argv:
@@ -85,7 +89,7 @@ def main(config: Config):
             response, ctxs, metadata = assistant.answer(question=item.question)
             responses.append(response)
             contexts.append(ctxs)
-            json.dump(
+            json_dump(
                 {
                     "question": item.question,
                     "golden": item.golden_answers,
@@ -112,7 +116,7 @@ def main(config: Config):
         log=True,
     )
     with open(eval_score_path, "w", encoding="utf-8") as f:
-        json.dump(
+        json_dump(
             {
                 "eval_scores": resp_score,
                 "eval_details": resp_score_detail,
@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import sys
@@ -13,7 +12,12 @@ from flexrag.common_dataclass import Context, RetrievedContext
 from flexrag.datasets import MTEBDataset, MTEBDatasetConfig
 from flexrag.metrics import Evaluator, EvaluatorConfig
 from flexrag.retriever import RETRIEVERS
-from flexrag.utils import LOGGER_MANAGER, SimpleProgressLogger, load_user_module
+from flexrag.utils import (
+    LOGGER_MANAGER,
+    SimpleProgressLogger,
+    json_dump,
+    load_user_module,
+)
 
 # load user modules before loading config
 for arg in sys.argv:
@@ -80,7 +84,7 @@ def main(config: Config):
             goldens.append(item.contexts)
             ctxs = retriever.search(query=item.question)[0]
             retrieved.append(ctxs)
-            json.dump(
+            json_dump(
                 {
                     "question": item.question,
                     "golden_contexts": item.contexts,
@@ -102,7 +106,7 @@ def main(config: Config):
         log=True,
     )
     with open(eval_score_path, "w", encoding="utf-8") as f:
-        json.dump(
+        json_dump(
             {
                 "eval_scores": resp_score,
                 "eval_details": resp_score_detail,
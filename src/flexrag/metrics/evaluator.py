@@ -1,3 +1,4 @@
+import asyncio
 from dataclasses import dataclass, field
 
 from flexrag.common_dataclass import RetrievedContext
@@ -77,15 +78,44 @@ class Evaluator:
             golden_responses = [
                 [self.response_pipeline(g) for g in golds] for golds in golden_responses
             ]
-        for metric in self.metrics:
-            metric = str(metric)  # make json serializable
-            r, r_detail = self.metrics[metric](
-                questions=questions,
-                responses=responses,
-                golden_responses=golden_responses,
-                retrieved_contexts=retrieved_contexts,
-                golden_contexts=golden_contexts,
+        metric_names = [str(metric) for metric in self.metrics]  # json serializable
+
+        async def compute_all() -> list[tuple[dict[str, float], dict]]:
+            return await asyncio.gather(
+                *(
+                    metric.async_compute(
+                        questions=questions,
+                        responses=responses,
+                        golden_responses=golden_responses,
+                        retrieved_contexts=retrieved_contexts,
+                        golden_contexts=golden_contexts,
+                    )
+                    for metric in self.metrics.values()
+                )
             )
+
+        # independent metrics share no state, so they are computed
+        # concurrently; fall back to the serial loop when the caller
+        # already runs inside an event loop
+        try:
+            asyncio.get_running_loop()
+            in_event_loop = True
+        except RuntimeError:
+            in_event_loop = False
+        if (len(self.metrics) > 1) and (not in_event_loop):
+            results = asyncio.run(compute_all())
+        else:
+            results = [
+                metric(
+                    questions=questions,
+                    responses=responses,
+                    golden_responses=golden_responses,
+                    retrieved_contexts=retrieved_contexts,
+                    golden_contexts=golden_contexts,
+                )
+                for metric in self.metrics.values()
+            ]
+        for metric, (r, r_detail) in zip(metric_names, results):
             if log:
                 for name, score in r.items():
                     logger.info(f"{name}: {score*100:.{self.round}f}%")
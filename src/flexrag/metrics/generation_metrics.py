@@ -1,5 +1,9 @@
+import os
 from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import Optional
 
+import numpy as np
 import rouge
 import sacrebleu
 
@@ -28,17 +32,24 @@ class BLEU(MetricsBase):
     def __init__(self, cfg: BLEUConfig):
         super().__init__(cfg)
         self.tokenizer = cfg.tokenizer
+        # the scorer (and its tokenizer state) is constructed once and
+        # reused across compute calls
+        self.scorer = sacrebleu.BLEU(tokenize=cfg.tokenizer)
+        self._cached_references: Optional[list[list[str]]] = None
         return
 
     @TIME_METER("metrics.generation_bleu")
     def compute(
         self, responses: list[str], golden_responses: list[list[str]], **kwargs
     ) -> tuple[dict[str, float], dict[str, float]]:
-        bleu = sacrebleu.corpus_bleu(
-            hypotheses=responses,
-            references=golden_responses,
-            tokenize=self.tokenizer,
-        )
+        # let the scorer cache the tokenized references, so repeated
+        # evaluations against the same golden responses skip retokenization
+        if golden_responses != self._cached_references:
+            self.scorer = sacrebleu.BLEU(
+                tokenize=self.tokenizer, references=golden_responses
+            )
+            self._cached_references = golden_responses
+        bleu = self.scorer.corpus_score(hypotheses=responses, references=None)
         return {"response_bleu": bleu.score}, vars(bleu)
 
 
@@ -69,20 +80,59 @@ class chrF(MetricsBase):
         self.beta = cfg.chrf_beta
         self.char_order = cfg.chrf_char_order
         self.word_order = cfg.chrf_word_order
+        self.scorer = sacrebleu.CHRF(
+            char_order=cfg.chrf_char_order,
+            word_order=cfg.chrf_word_order,
+            beta=cfg.chrf_beta,
+        )
+        self._cached_references: Optional[list[list[str]]] = None
         return
 
     @TIME_METER("metrics.generation_chrf")
     def compute(
         self, responses: list[str], golden_responses: list[list[str]], **kwargs
     ) -> tuple[dict[str, float], dict[str, float]]:
-        chrf = sacrebleu.corpus_chrf(
-            hypotheses=responses,
-            references=golden_responses,
-            beta=self.beta,
-        )
+        if golden_responses != self._cached_references:
+            self.scorer = sacrebleu.CHRF(
+                char_order=self.char_order,
+                word_order=self.word_order,
+                beta=self.beta,
+                references=golden_responses,
+            )
+            self._cached_references = golden_responses
+        chrf = self.scorer.corpus_score(hypotheses=responses, references=None)
         return {"response_chrf": chrf.score}, vars(chrf)
 
 
+# the scorer is built lazily in each worker process,
+# which avoids pickling it along with every task
+_ROUGE_SCORER: Optional[rouge.Rouge] = None
+
+
+def _compute_rouge_item(args: tuple[list[str], str]) -> dict[str, dict[str, float]]:
+    global _ROUGE_SCORER
+    if _ROUGE_SCORER is None:
+        _ROUGE_SCORER = rouge.Rouge(metrics=["rouge-1", "rouge-2", "rouge-l"])
+    golds, response = args
+    # as rouge score does not support multiple references, we take the max score.
+    score_dict = {
+        "rouge-1": {"r": 0.0, "p": 0.0, "f": 0.0},
+        "rouge-2": {"r": 0.0, "p": 0.0, "f": 0.0},
+        "rouge-l": {"r": 0.0, "p": 0.0, "f": 0.0},
+    }
+    if len(golds) == 0:
+        return score_dict
+    # score all the references in one batched call
+    rouge_scores = _ROUGE_SCORER.get_scores([response] * len(golds), golds)
+    for rouge_score in rouge_scores:
+        for metric in score_dict.keys():
+            for key in ["r", "p", "f"]:
+                score_dict[metric][key] = max(
+                    score_dict[metric][key], rouge_score[metric][key]
+                )
+    return score_dict
+
+
 @METRICS("generation_rouge")
 class Rouge(MetricsBase):
     """The Rouge metric.
@@ -90,31 +140,40 @@ class Rouge(MetricsBase):
     This metric will return the average of the Rouge-1, Rouge-2, and Rouge-L F1 scores.
     """
 
-    def __init__(self) -> None:
-        self.scorer = rouge.Rouge(metrics=["rouge-1", "rouge-2", "rouge-l"])
-        return
+    # scoring below this amount of items is done serially,
+    # as spawning the workers would dominate the runtime
+    parallel_threshold = 32
 
     @TIME_METER("metrics.generation_rouge")
     def compute(
         self, responses: list[str], golden_responses: list[list[str]], **kwargs
     ) -> tuple[dict[str, float], dict[str, float]]:
-        score_dict = {
-            "rouge-1": {"r": [], "p": [], "f": []},
-            "rouge-2": {"r": [], "p": [], "f": []},
-            "rouge-l": {"r": [], "p": [], "f": []},
-        }
+        metrics = ("rouge-1", "rouge-2", "rouge-l")
+        keys = ("r", "p", "f")
         # collect all the scores
-        for golds, response in zip(golden_responses, responses):
-            details = self.compute_item(golds, response)
-            for metric in score_dict.keys():
-                for key in ["r", "p", "f"]:
-                    score_dict[metric][key].append(details[metric][key])
-        # average the scores
-        for metric in score_dict.keys():
-            for key in ["r", "p", "f"]:
-                score_dict[metric][key] = sum(score_dict[metric][key]) / len(
-                    score_dict[metric][key]
+        # the scoring is pure python and compute bound,
+        # thus it is distributed across processes for large evaluation sets
+        pairs = list(zip(golden_responses, responses))
+        num_procs = min(os.cpu_count() or 1, len(pairs))
+        if (num_procs > 1) and (len(pairs) >= self.parallel_threshold):
+            with get_context().Pool(processes=num_procs) as pool:
+                details_list = pool.map(
+                    _compute_rouge_item,
+                    pairs,
+                    chunksize=max(1, len(pairs) // (num_procs * 4)),
                 )
+        else:
+            details_list = [_compute_rouge_item(pair) for pair in pairs]
+        # average the scores in a single vectorized reduction
+        scores = np.array(
+            [[[d[m][k] for k in keys] for m in metrics] for d in details_list],
+            dtype=np.float32,
+        )
+        mean_scores = scores.mean(axis=0)
+        score_dict = {
+            m: {k: float(mean_scores[i, j]) for j, k in enumerate(keys)}
+            for i, m in enumerate(metrics)
+        }
         return {
             "rouge-1": score_dict["rouge-1"]["f"],
             "rouge-2": score_dict["rouge-2"]["f"],
@@ -124,17 +183,4 @@ class Rouge(MetricsBase):
     def compute_item(
         self, golds: list[str], response: str
     ) -> tuple[dict[str, float], dict[str, float]]:
-        # as rouge score does not support multiple references, we take the max score.
-        score_dict = {
-            "rouge-1": {"r": 0.0, "p": 0.0, "f": 0.0},
-            "rouge-2": {"r": 0.0, "p": 0.0, "f": 0.0},
-            "rouge-l": {"r": 0.0, "p": 0.0, "f": 0.0},
-        }
-        for gold in golds:
-            rouge_score = self.scorer.get_scores(response, gold)[0]
-            for metric in score_dict.keys():
-                for key in ["r", "p", "f"]:
-                    score_dict[metric][key] = max(
-                        score_dict[metric][key], rouge_score[metric][key]
-                    )
-        return score_dict
+        return _compute_rouge_item((golds, response))
@@ -21,6 +21,18 @@ std::vector<std::vector<bool>> get_contain_map(const std::vector<std::string>& e
     return results;
 }
 
+bool get_any_contain(const std::vector<std::string>& evs, const std::vector<std::string>& rets) {
+    for (const auto& ret : rets) {
+        for (const auto& ev : evs) {
+            if (ret.find(ev) != std::string::npos) {
+                return true;
+            }
+        }
+    }
+    return false;
+}
+
 PYBIND11_MODULE(lib_rel, m) {
     m.def("get_contain_map", &get_contain_map, "Get contain map.");
+    m.def("get_any_contain", &get_any_contain, "Check whether any evidence is contained in any retrieved text.");
 }
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 from flexrag.common_dataclass import RetrievedContext
@@ -37,6 +38,41 @@ class MetricsBase(ABC):
             golden_contexts=golden_contexts,
         )
 
+    async def async_compute(
+        self,
+        questions: list[str] = None,
+        responses: list[str] = None,
+        golden_responses: list[list[str]] = None,
+        retrieved_contexts: list[list[str | RetrievedContext]] = None,
+        golden_contexts: list[list[str]] = None,
+    ) -> tuple[dict[str, float], dict]:
+        """
+        Compute the metric value asynchronously.
+        The default implementation runs ``compute`` in a worker thread so that
+        independent metrics can be evaluated concurrently.
+
+        :param questions: A list of questions. Defaults to None.
+        :param responses: A list of responses. Defaults to None.
+        :param golden_responses: A list of golden responses. Defaults to None.
+        :param retrieved_contexts: A list of retrieved contexts. Defaults to None.
+        :param golden_contexts: A list of golden contexts. Defaults to None.
+        :type questions: list[str], optional
+        :type responses: list[str], optional
+        :type golden_responses: list[list[str]], optional
+        :type retrieved_contexts: list[list[str | RetrievedContext]], optional
+        :type golden_contexts: list[list[str]], optional
+        :return: The metric scores and the metadata of the metric.
+        :rtype: tuple[dict[str, float], dict]
+        """
+        return await asyncio.to_thread(
+            self.compute,
+            questions=questions,
+            responses=responses,
+            golden_responses=golden_responses,
+            retrieved_contexts=retrieved_contexts,
+            golden_contexts=golden_contexts,
+        )
+
     @abstractmethod
     def compute(
         self,
@@ -1,3 +1,4 @@
+from bisect import bisect_right
 from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Optional
@@ -17,16 +18,109 @@ try:
 except:
     has_librel = False
 
+try:
+    # only available in lib_rel builds that ship the early-exit entry point
+    from .lib_rel import get_any_contain
+
+    has_librel_any = True
+except:
+    has_librel_any = False
+
+try:
+    import ahocorasick
+
+    has_ahocorasick = True
+except ImportError:
+    has_ahocorasick = False
+
+
+def _get_contain_map_aho(
+    evidences: list[str], retrieved: list[str]
+) -> list[list[bool]]:
+    # build a multi-pattern automaton once and scan each retrieved text in C
+    if len(evidences) == 0:
+        return [[] for _ in retrieved]
+    # `add_word("")` is a no-op in pyahocorasick, so empty evidences are
+    # handled apart: the empty string is contained in every text
+    empty_row = [evd == "" for evd in evidences]
+    evidence_ids: dict[str, list[int]] = {}
+    for idx, evd in enumerate(evidences):
+        if evd != "":
+            evidence_ids.setdefault(evd, []).append(idx)
+    automaton = None
+    if evidence_ids:
+        automaton = ahocorasick.Automaton()
+        for evd, ids in evidence_ids.items():
+            automaton.add_word(evd, ids)
+        automaton.make_automaton()
+    contain_map: list[list[bool]] = []
+    for ret in retrieved:
+        row = empty_row.copy()
+        if automaton is not None:
+            for _, ids in automaton.iter(ret):
+                for idx in ids:
+                    row[idx] = True
+        contain_map.append(row)
+    return contain_map
+
+
+def _get_contain_map_bytes(
+    evidences: list[str], retrieved: list[str]
+) -> list[list[bool]]:
+    # concatenate the retrieved texts into one buffer and scan it with
+    # `bytes.find` (a SIMD accelerated memmem), which is much faster than
+    # running `str.__contains__` over many small strings
+    if len(retrieved) == 0:
+        return []
+    sep = b"\x00"
+    encoded = [ret.encode() for ret in retrieved]
+    joined = sep.join(encoded)
+    starts: list[int] = []
+    offset = 0
+    for ret in encoded:
+        starts.append(offset)
+        offset += len(ret) + len(sep)
+    contain_map = [[False] * len(evidences) for _ in retrieved]
+    for idx, evd in enumerate(evidences):
+        evd_bytes = evd.encode()
+        if not evd_bytes:
+            # the empty string is contained in every text; `find` with an
+            # empty needle never returns -1 and would loop forever
+            for row in contain_map:
+                row[idx] = True
+            continue
+        if sep in evd_bytes:  # cannot match across the separator
+            for r, ret in enumerate(retrieved):
+                contain_map[r][idx] = evd in ret
+            continue
+        pos = joined.find(evd_bytes)
+        while pos != -1:
+            r = bisect_right(starts, pos) - 1
+            contain_map[r][idx] = True
+            # jump to the next retrieved text
+            next_start = starts[r + 1] if r + 1 < len(starts) else len(joined)
+            pos = joined.find(evd_bytes, next_start)
+    return contain_map
+
 
 def get_contain_map_py(evidences: list[str], retrieved: list[str]) -> list[list[bool]]:
     if has_librel:
         return get_contain_map(evidences, retrieved)
-    contain_map: list[list[bool]] = []
+    if has_ahocorasick:
+        return _get_contain_map_aho(evidences, retrieved)
+    return _get_contain_map_bytes(evidences, retrieved)
+
+
+def get_any_contain_py(evidences: list[str], retrieved: list[str]) -> bool:
+    """Return whether any evidence is contained in any retrieved text,
+    stopping at the first hit instead of materializing the full contain map."""
+    if has_librel_any:
+        return get_any_contain(evidences, retrieved)
     for ret in retrieved:
-        contain_map.append([])
         for evd in evidences:
-            contain_map[-1].append(evd in ret)
-    return contain_map
+            if evd in ret:
+                return True
+    return False
 
 
 @dataclass
@@ -73,9 +167,7 @@ class SuccessRate(MetricsBase):
             if isinstance(ctxs[0], dict):
                 ctxs = [ctx["data"][self.eval_field] for ctx in ctxs]
             ctxs = [self.context_pipeline(ctx) for ctx in ctxs]
-            rel_map = get_contain_map_py(golds, ctxs)
-            is_success = any(sum(rel_map, []))
-            success_map.append(is_success)
+            success_map.append(get_any_contain_py(golds, ctxs))
         score = sum(success_map) / len(success_map)
         return {"retrieval_success_rate": score}, {"success_map": success_map}
 
@@ -49,7 +49,7 @@ class AnthropicGenerator(GeneratorBase):
 
         # set proxy
         if cfg.proxy is not None:
-            client = httpx.Client(proxies=cfg.proxy)
+            client = httpx.Client(proxy=cfg.proxy)
         else:
             client = None
 
@@ -8,6 +8,14 @@ import numpy as np
 from numpy import ndarray
 from omegaconf import MISSING
 
+try:
+    from cohere import ClientV2
+except ImportError as e:
+    raise ImportError(
+        "The `cohere` package is required to use the CohereEncoder. "
+        "Please install it with `pip install cohere`."
+    ) from e
+
 from flexrag.utils import TIME_METER, Choices
 
 from .model_base import ENCODERS, EncoderBase
@@ -47,10 +55,8 @@ class CohereEncoderConfig:
 @ENCODERS("cohere", config_class=CohereEncoderConfig)
 class CohereEncoder(EncoderBase):
     def __init__(self, cfg: CohereEncoderConfig):
-        from cohere import ClientV2
-
         if cfg.proxy is not None:
-            httpx_client = httpx.Client(proxies=cfg.proxy)
+            httpx_client = httpx.Client(proxy=cfg.proxy)
         else:
             httpx_client = None
         self.client = ClientV2(
@@ -1,5 +1,8 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 
 import numpy as np
@@ -8,7 +11,6 @@ import torch.nn.functional as F
 from omegaconf import MISSING
 from PIL.ImageFile import ImageFile
 from PIL.Image import Image
-from torch.nn.parallel import DataParallel as DP
 from transformers import (
     AutoConfig,
     AutoImageProcessor,
@@ -20,18 +22,10 @@ from transformers import (
     AutoModelForVision2Seq,
     AutoProcessor,
     AutoTokenizer,
-    BertModel,
-    BertPreTrainedModel,
     CLIPModel,
 )
 from transformers import GenerationConfig as HFGenerationConfig
-from transformers import (
-    PreTrainedModel,
-    PreTrainedTokenizer,
-    XLMRobertaModel,
-    XLMRobertaPreTrainedModel,
-)
-from transformers.dynamic_module_utils import get_class_from_dynamic_module
+from transformers import PreTrainedModel, PreTrainedTokenizer
 
 from flexrag.prompt import ChatPrompt, MultiModelChatPrompt, load_template
 from flexrag.utils import LOGGER_MANAGER, TIME_METER, Choices
@@ -49,17 +43,26 @@ from .utils import guess_model_name, configure_attn
 logger = LOGGER_MANAGER.get_logger("flexrag.models.hf_model")
 
 
+@lru_cache(maxsize=None)
 def get_colbert_model(
     base_model: str = "bert",
     output_dim: int = 128,
     model_path: str = None,
 ):
     """Code adapted from https://github.com/hotchpotch/JQaRA/blob/main/evaluator/reranker/colbert_reranker.py"""
+    # imported lazily so that importing this module does not pull in the
+    # ColBERT base model classes
+    from transformers.dynamic_module_utils import get_class_from_dynamic_module
+
     match base_model:
         case "bert":
+            from transformers import BertModel, BertPreTrainedModel
+
             pretrained_class = BertPreTrainedModel
             model_class = BertModel
         case "xlm-roberta":
+            from transformers import XLMRobertaModel, XLMRobertaPreTrainedModel
+
             pretrained_class = XLMRobertaPreTrainedModel
             model_class = XLMRobertaModel
         case "self_implemented":
@@ -114,6 +117,27 @@ def get_colbert_model(
     return ColBERTModel
 
 
+def _pack_by_token_budget(lengths: list[int], budget: int) -> list[list[int]]:
+    """Greedily pack item indices into sub-batches whose padded size
+    (batch size x longest item) stays within the token budget. The items are
+    visited longest first so that each sub-batch holds items of similar
+    length, which minimizes padding."""
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    batch_max = 0
+    for idx in order:
+        if batch and (len(batch) + 1) * max(batch_max, lengths[idx]) > budget:
+            batches.append(batch)
+            batch = []
+            batch_max = 0
+        batch.append(idx)
+        batch_max = max(batch_max, lengths[idx])
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 def load_hf_model(
     model_path: str,
     tokenizer_path: Optional[str] = None,
@@ -291,11 +315,15 @@ class HFGeneratorConfig(HFModelConfig):
     :param use_minference: Whether to use minference for long sequence inference. Default is False.
     :type use_minference: bool
     :param model_type: The type of the model. Default is "causal_lm". Available choices are "causal_lm", "seq2seq".
+    :param max_tokens_per_batch: The padded token budget (batch size x longest prefix) per forward pass.
+        None for processing all prefixes in one batch. Default is None.
+    :type max_tokens_per_batch: Optional[int]
     """
 
     pipeline_parallel: bool = False
     use_minference: bool = False
     model_type: Choices(["causal_lm", "seq2seq"]) = "causal_lm"  # type: ignore
+    max_tokens_per_batch: Optional[int] = None
 
 
 @GENERATORS("hf", config_class=HFGeneratorConfig)
@@ -314,6 +342,7 @@ class HFGenerator(GeneratorBase):
             pipeline_parallel=cfg.pipeline_parallel,
         )
         self.model_type = cfg.model_type
+        self.max_tokens_per_batch = cfg.max_tokens_per_batch
         self._patch_model()
 
         # prepare prompt function
@@ -340,6 +369,29 @@ class HFGenerator(GeneratorBase):
         self,
         prefixes: list[str],
         generation_config: GenerationConfig = GenerationConfig(),
+    ) -> list[list[str]]:
+        # split large inputs into token-budgeted sub-batches to keep the GPU
+        # fed without exhausting memory on long prefixes
+        if self.max_tokens_per_batch is not None:
+            lengths = [
+                len(ids) for ids in self.tokenizer(prefixes, truncation=True).input_ids
+            ]
+            batches = _pack_by_token_budget(lengths, self.max_tokens_per_batch)
+            if len(batches) > 1:
+                responses: list[list[str]] = [None] * len(prefixes)
+                for batch in batches:
+                    batch_responses = self._generate_batch(
+                        [prefixes[i] for i in batch], generation_config
+                    )
+                    for i, response in zip(batch, batch_responses):
+                        responses[i] = response
+                return responses
+        return self._generate_batch(prefixes, generation_config)
+
+    def _generate_batch(
+        self,
+        prefixes: list[str],
+        generation_config: GenerationConfig = GenerationConfig(),
     ) -> list[list[str]]:
         bsz = len(prefixes)
         sample_num = generation_config.sample_num
@@ -353,7 +405,7 @@ class HFGenerator(GeneratorBase):
         if generation_config.eos_token_id is not None:
             inputs["eos_token_id"] = generation_config.eos_token_id
         else:
-            inputs["eos_token_id"] = self.tokenizer.eos_token_id
+            inputs["eos_token_id"] = self._eos_token_id
 
         # generate
         outputs = self.model.generate(
@@ -364,25 +416,15 @@ class HFGenerator(GeneratorBase):
 
         # truncate the input tokens
         if self.model_type == "causal_lm":
-            outputs = outputs.view(bsz, sample_num, -1)
-            input_lengths = inputs["attention_mask"].sum(dim=1)
-            responses = []
-            for i in range(bsz):
-                samples = [sample[input_lengths[i] :] for sample in outputs[i]]
-                samples = [
-                    self.tokenizer.decode(sample, skip_special_tokens=True)
-                    for sample in samples
-                ]
-                responses.append(samples)
-        elif self.model_type == "seq2seq":
-            outputs = outputs.view(bsz, sample_num, -1)
-            responses = [
-                [
-                    self.tokenizer.decode(sample, skip_special_tokens=True)
-                    for sample in samples
-                ]
-                for samples in outputs
-            ]
+            # inputs are left padded, so the generated suffix is contiguous
+            input_length = inputs["input_ids"].shape[1]
+            outputs = outputs[:, input_length:]
+
+        # decode all samples in one call to amortize the Python->C transitions
+        decoded = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        responses = [
+            decoded[i * sample_num : (i + 1) * sample_num] for i in range(bsz)
+        ]
         return responses
 
     async def async_generate(
@@ -433,6 +475,11 @@ class HFGenerator(GeneratorBase):
         if self.tokenizer.pad_token_id is None:
             self.tokenizer.add_special_tokens({"pad_token": "<pad>"})
             self.model.resize_token_embeddings(len(self.tokenizer))
+        if self.model_type == "causal_lm":
+            # left padding lets us slice the generated suffix contiguously
+            # and avoids spending decode steps on pad tokens
+            self.tokenizer.padding_side = "left"
+        self._eos_token_id = self.tokenizer.eos_token_id
         return
 
 
@@ -542,6 +589,9 @@ class HFEncoderConfig(HFModelConfig):
     :type prompt: str
     :param task: The task to use. Default is "".
     :type task: str
+    :param max_tokens_per_batch: The padded token budget (batch size x longest text) per forward pass.
+        None for encoding all texts in one batch. Default is None.
+    :type max_tokens_per_batch: Optional[int]
     """
 
     max_encode_length: int = 512
@@ -549,6 +599,7 @@ class HFEncoderConfig(HFModelConfig):
     normalize: bool = False
     prompt: str = ""  # used in nomic-text-embedding
     task: str = ""  # used in jina-embedding
+    max_tokens_per_batch: Optional[int] = None
 
 
 @ENCODERS("hf", config_class=HFEncoderConfig)
@@ -563,14 +614,23 @@ class HFEncoder(EncoderBase):
             device_id=cfg.device_id,
             trust_remote_code=cfg.trust_remote_code,
         )
+        # replicate the model on each device for sharded inference
+        # (torch.nn.DataParallel scatters/gathers on every call and is
+        # serialized by the GIL, so we keep one persistent replica per device
+        # and split the input list across them instead)
+        self._replicas = [self.model]
+        self._shard_executor = None
         if len(self.devices) > 1:
             if self.is_jina:
                 logger.warning("Data parallel does not support self implemented model.")
-                self.dp_model = None
             else:
-                self.dp_model = DP(self.model, device_ids=self.devices)
-        else:
-            self.dp_model = None
+                for device in self.devices[1:]:
+                    replica = deepcopy(self.model).to(torch.device(device))
+                    replica.eval()
+                    self._replicas.append(replica)
+                self._shard_executor = ThreadPoolExecutor(
+                    max_workers=len(self._replicas)
+                )
 
         # setup arguments
         self.max_encode_length = cfg.max_encode_length
@@ -578,25 +638,47 @@ class HFEncoder(EncoderBase):
         self.normalize = cfg.normalize
         self.prompt = cfg.prompt
         self.task = cfg.task
+        self.max_tokens_per_batch = cfg.max_tokens_per_batch
+
+        # autocast the forward pass when the model is loaded in half precision
+        match cfg.load_dtype:
+            case "float16" | "fp16" | "half":
+                self._autocast_dtype = torch.float16
+            case "bfloat16" | "bf16":
+                self._autocast_dtype = torch.bfloat16
+            case _:
+                self._autocast_dtype = None
         return
 
     def get_embedding(
         self, hidden: torch.Tensor, attn_mask: torch.Tensor
     ) -> np.ndarray:
         if self.encode_method == "mean":
-            attn_mask = attn_mask.to(hidden.device)
-            embeddings = hidden.masked_fill(~attn_mask[..., None].bool(), 0.0)
-            embeddings = embeddings.sum(dim=1) / attn_mask.sum(dim=1)[..., None]
+            # the caller already moved the mask onto the model device;
+            # use it as float weights so the masking and the mean run as a
+            # single fused reduction instead of masked_fill + sum + div
+            weights = attn_mask[..., None].to(hidden.dtype)
+            embeddings = (hidden * weights).sum(dim=1) / weights.sum(
+                dim=1
+            ).clamp_min(1)
         elif self.encode_method == "cls":
             embeddings = hidden[:, 0]
         else:
             raise ValueError(f"Unsupported encode method: {self.encode_method}")
         if self.normalize:
             embeddings = torch.nn.functional.normalize(embeddings, dim=1)
-        return embeddings.float().cpu().numpy()
+        embeddings = embeddings.float()
+        if embeddings.device.type == "cuda":
+            # stage the copy through pinned host memory so the D2H transfer
+            # is a single async DMA instead of a blocking pageable copy
+            out = torch.empty_like(embeddings, device="cpu", pin_memory=True)
+            out.copy_(embeddings, non_blocking=True)
+            torch.cuda.synchronize(embeddings.device)
+            return out.numpy()
+        return embeddings.cpu().numpy()
 
     @TIME_METER("hf_encode")
-    @torch.no_grad()
+    @torch.inference_mode()
     def _encode(self, texts: list[str | list[str]]) -> np.ndarray:
         if self.is_jina:  # for jina-embedding
             return self.model.encode(
@@ -612,13 +694,50 @@ class HFEncoder(EncoderBase):
         if self.prompt:
             texts = [f"{self.prompt}{i}" for i in texts]
 
-        # prepare encoder
-        if (len(texts) >= len(self.devices) * 8) and (self.dp_model is not None):
-            encoder = self.dp_model
-        else:
-            encoder = self.model
+        # split large inputs into token-budgeted sub-batches to avoid OOM on
+        # long texts while keeping the sub-batches tightly packed
+        if self.max_tokens_per_batch is not None:
+            lengths = [
+                len(ids)
+                for ids in self.tokenizer(
+                    texts, truncation=True, max_length=self.max_encode_length
+                ).input_ids
+            ]
+            batches = _pack_by_token_budget(lengths, self.max_tokens_per_batch)
+            if len(batches) > 1:
+                embeddings = None
+                for batch in batches:
+                    batch_emb = self._encode_batch([texts[i] for i in batch])
+                    if embeddings is None:
+                        embeddings = np.empty(
+                            (len(texts), batch_emb.shape[1]), dtype=batch_emb.dtype
+                        )
+                    embeddings[batch] = batch_emb
+                return embeddings
+        return self._encode_batch(texts)
+
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        # shard large batches across the device replicas
+        # (torch releases the GIL during the forward, so the replicas run
+        # concurrently on the thread pool)
+        if (self._shard_executor is not None) and (
+            len(texts) >= len(self._replicas) * 8
+        ):
+            shard_size = (len(texts) + len(self._replicas) - 1) // len(self._replicas)
+            futures = [
+                self._shard_executor.submit(
+                    self._encode_shard,
+                    model,
+                    texts[n * shard_size : (n + 1) * shard_size],
+                )
+                for n, model in enumerate(self._replicas)
+                if len(texts[n * shard_size : (n + 1) * shard_size]) > 0
+            ]
+            return np.concatenate([future.result() for future in futures], axis=0)
+        return self._encode_shard(self.model, texts)
 
-        # encode
+    @torch.inference_mode()
+    def _encode_shard(self, model: PreTrainedModel, texts: list[str]) -> np.ndarray:
         input_dict = self.tokenizer.batch_encode_plus(
             texts,
             return_tensors="pt",
@@ -626,10 +745,14 @@ class HFEncoder(EncoderBase):
             padding=True,
             truncation=True,
         )  # TODO: This step is slow
-        if not isinstance(encoder, DP):
-            input_dict = input_dict.to(encoder.device)
+        input_dict = input_dict.to(model.device)
         mask = input_dict["attention_mask"]
-        output = encoder(**input_dict).last_hidden_state
+        with torch.autocast(
+            device_type=input_dict["input_ids"].device.type,
+            dtype=self._autocast_dtype,
+            enabled=self._autocast_dtype is not None,
+        ):
+            output = model(**input_dict).last_hidden_state
         embeddings = self.get_embedding(output, mask)
         return embeddings
 
@@ -1,6 +1,7 @@
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 import numpy as np
 from PIL.Image import Image
@@ -54,18 +55,40 @@ class GenerationConfig:
         assert self.top_k > 0, "top_k must be greater than 0"
 
 
+def _group_by_generation_config(
+    generation_configs: list[GenerationConfig],
+) -> list[tuple[GenerationConfig, list[int]]]:
+    """Group the prompt indices that share an equal GenerationConfig."""
+    groups: list[tuple[GenerationConfig, list[int]]] = []
+    for i, cfg in enumerate(generation_configs):
+        for group_cfg, indices in groups:
+            if group_cfg == cfg:
+                indices.append(i)
+                break
+        else:
+            groups.append((cfg, [i]))
+    return groups
+
+
 class GeneratorBase(ABC):
+    # whether `_chat` / `_generate` accept a list of per-prompt
+    # GenerationConfigs in one call
+    support_batched_generation_config = False
+
     def chat(
         self,
         prompts: list[ChatPrompt] | list[list[dict]] | ChatPrompt | list[dict],
-        generation_config: GenerationConfig = GenerationConfig(),
+        generation_config: (
+            GenerationConfig | list[GenerationConfig]
+        ) = GenerationConfig(),
     ) -> list[list[str]]:
         """chat with the model using model templates.
 
         :param prompts: A batch of ChatPrompts.
         :type prompts: list[ChatPrompt] | list[list[dict]] | ChatPrompt | list[dict]
-        :param generation_config: GenerationConfig. Defaults to GenerationConfig().
-        :type generation_config: GenerationConfig
+        :param generation_config: GenerationConfig, or one GenerationConfig
+            per prompt. Defaults to GenerationConfig().
+        :type generation_config: GenerationConfig | list[GenerationConfig]
         :return: A batch of chat responses.
         :rtype: list[list[str]]
         """
@@ -74,8 +97,45 @@ class GeneratorBase(ABC):
         for i in range(len(prompts)):
             if isinstance(prompts[i], list):
                 prompts[i] = ChatPrompt.from_list(prompts[i])
+        generation_config = self._normalize_generation_config(
+            generation_config, len(prompts)
+        )
+        if isinstance(generation_config, list) and (
+            not self.support_batched_generation_config
+        ):
+            return self._dispatch_by_config(self._chat, prompts, generation_config)
         return self._chat(prompts, generation_config=generation_config)
 
+    def _normalize_generation_config(
+        self,
+        generation_config: GenerationConfig | list[GenerationConfig],
+        prompt_num: int,
+    ) -> GenerationConfig | list[GenerationConfig]:
+        if not isinstance(generation_config, (list, tuple)):
+            return generation_config
+        assert (
+            len(generation_config) == prompt_num
+        ), "The number of generation configs must match the number of prompts."
+        # collapse to a single config when all the configs are equal
+        if all(cfg == generation_config[0] for cfg in generation_config[1:]):
+            return generation_config[0]
+        return list(generation_config)
+
+    def _dispatch_by_config(
+        self,
+        run_fn: Callable[..., list[list[str]]],
+        inputs: list,
+        generation_configs: list[GenerationConfig],
+    ) -> list[list[str]]:
+        # for backends without per-prompt sampling support, keep batching by
+        # grouping the prompts that share a config
+        results: list[list[str]] = [None] * len(inputs)
+        for cfg, indices in _group_by_generation_config(generation_configs):
+            sub_results = run_fn([inputs[i] for i in indices], generation_config=cfg)
+            for i, result in zip(indices, sub_results):
+                results[i] = result
+        return results
+
     @abstractmethod
     def _chat(
         self,
@@ -98,19 +158,29 @@ class GeneratorBase(ABC):
     def generate(
         self,
         prefixes: list[str] | str,
-        generation_config: GenerationConfig = GenerationConfig(),
+        generation_config: (
+            GenerationConfig | list[GenerationConfig]
+        ) = GenerationConfig(),
     ) -> list[list[str]]:
         """generate text with the model using the given prefixes.
 
         :param prefixes: A batch of prefixes.
         :type prefixes: list[str] | str
-        :param generation_config: GenerationConfig. Defaults to GenerationConfig().
-        :type generation_config: GenerationConfig
+        :param generation_config: GenerationConfig, or one GenerationConfig
+            per prefix. Defaults to GenerationConfig().
+        :type generation_config: GenerationConfig | list[GenerationConfig]
         :return: A batch of generated text.
         :rtype: list[list[str]]
         """
         if isinstance(prefixes, str):
             prefixes = [prefixes]
+        generation_config = self._normalize_generation_config(
+            generation_config, len(prefixes)
+        )
+        if isinstance(generation_config, list) and (
+            not self.support_batched_generation_config
+        ):
+            return self._dispatch_by_config(self._generate, prefixes, generation_config)
         return self._generate(prefixes, generation_config=generation_config)
 
     @abstractmethod
@@ -248,6 +318,79 @@ class EncoderBase(ABC):
         )
         return self.encode(texts)
 
+    # tunables for `_encode_coalesced`
+    coalesce_max_batch_size: int = 128
+    coalesce_max_wait: float = 0.01
+
+    async def _encode_coalesced(
+        self,
+        texts: list[str],
+        encode_fn: Callable[[list[str]], Awaitable[np.ndarray]],
+    ) -> np.ndarray:
+        """Coalesce concurrent ``async_encode`` awaiters into shared batches.
+
+        Callers awaiting at the same time are merged into one ``encode_fn``
+        call once ``coalesce_max_batch_size`` texts are pending or after
+        ``coalesce_max_wait`` seconds, whichever comes first. Each awaiter
+        receives the slice of the batched embeddings that belongs to its
+        texts. Subclasses with an asynchronous backend can route their
+        ``async_encode`` through this helper to turn many small requests
+        into a few large ones.
+
+        :param texts: The texts submitted by one awaiter.
+        :type texts: list[str]
+        :param encode_fn: The coroutine function that encodes a merged batch.
+        :type encode_fn: Callable[[list[str]], Awaitable[np.ndarray]]
+        :return: The embeddings of `texts`.
+        :rtype: np.ndarray
+        """
+        try:
+            state = self._coalesce_state
+        except AttributeError:
+            state = self._coalesce_state = {"pending": [], "timer": None}
+        future = asyncio.get_running_loop().create_future()
+        state["pending"].append((texts, future))
+        if sum(len(t) for t, _ in state["pending"]) >= self.coalesce_max_batch_size:
+            self._flush_coalesced(encode_fn)
+        elif state["timer"] is None:
+            state["timer"] = asyncio.create_task(self._coalesce_timer(encode_fn))
+        return await future
+
+    async def _coalesce_timer(self, encode_fn) -> None:
+        try:
+            await asyncio.sleep(self.coalesce_max_wait)
+        except asyncio.CancelledError:
+            return
+        self._coalesce_state["timer"] = None
+        self._flush_coalesced(encode_fn)
+        return
+
+    def _flush_coalesced(self, encode_fn) -> None:
+        state = self._coalesce_state
+        pending, state["pending"] = state["pending"], []
+        timer, state["timer"] = state["timer"], None
+        if timer is not None:
+            timer.cancel()
+        if pending:
+            asyncio.ensure_future(self._run_coalesced(pending, encode_fn))
+        return
+
+    async def _run_coalesced(self, pending: list, encode_fn) -> None:
+        merged = [text for texts, _ in pending for text in texts]
+        try:
+            embeddings = await encode_fn(merged)
+        except Exception as err:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        offset = 0
+        for texts, future in pending:
+            if not future.done():
+                future.set_result(embeddings[offset : offset + len(texts)])
+            offset += len(texts)
+        return
+
     @property
     @abstractmethod
     def embedding_size(self) -> int:
@@ -1,7 +1,10 @@
 import asyncio
 import logging
 import os
+from base64 import b64decode
+from collections import OrderedDict
 from dataclasses import dataclass
+from hashlib import sha256
 from typing import Optional
 
 import httpx
@@ -9,6 +12,14 @@ import numpy as np
 from concurrent.futures import ThreadPoolExecutor
 from omegaconf import MISSING
 
+try:
+    from openai import AsyncAzureOpenAI, AsyncOpenAI, AzureOpenAI, OpenAI
+except ImportError as e:
+    raise ImportError(
+        "The `openai` package is required to use the OpenAI models. "
+        "Please install it with `pip install openai`."
+    ) from e
+
 from flexrag.prompt import ChatPrompt
 from flexrag.utils import TIME_METER, LOGGER_MANAGER
 
@@ -23,6 +34,15 @@ from .model_base import (
 logger = LOGGER_MANAGER.get_logger("flexrag.models.openai")
 
 
+# process-wide pool shared by all sync request fan-outs; threads are started
+# lazily, and reusing them keeps the underlying keep-alive sockets warm
+# across mini-batches instead of tearing the pool down after every call
+_OPENAI_POOL = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("FLEXRAG_OPENAI_WORKERS", "64")),
+    thread_name_prefix="openai",
+)
+
+
 @dataclass
 class OpenAIConfig:
     """The Base Configuration for OpenAI Client.
@@ -41,6 +61,13 @@ class OpenAIConfig:
     :type verbose: bool
     :param proxy: The proxy to use for the HTTP client. Default is None.
     :type proxy: Optional[str]
+    :param max_connections: The maximum number of HTTP connections. Default is 1000.
+    :type max_connections: int
+    :param max_keepalive_connections: The maximum number of keep-alive connections. Default is 100.
+    :type max_keepalive_connections: int
+    :param verify_model: Whether to verify that `model_name` is served by the endpoint
+        at construction time. Default is False.
+    :type verify_model: bool
     """
 
     is_azure: bool = False
@@ -50,6 +77,46 @@ class OpenAIConfig:
     api_version: str = "2024-07-01-preview"
     verbose: bool = False
     proxy: Optional[str] = None
+    max_connections: int = 1000
+    max_keepalive_connections: int = 100
+    verify_model: bool = False
+
+
+# the served model lists fetched by `_check`, keyed by endpoint credentials;
+# shared process-wide so repeated instantiations pay the round-trip once
+_MODELS_CACHE: dict[tuple[Optional[str], str], set[str]] = {}
+
+
+def _prepare_httpx_clients(cfg: OpenAIConfig) -> tuple[httpx.Client, httpx.AsyncClient]:
+    """Build the HTTP clients shared by the OpenAI wrappers.
+
+    The openai SDK's default client keeps httpx's conservative pool limits
+    (100 connections, 20 keep-alive), behind which parallel requests
+    serialize before ever reaching the API.
+
+    :param cfg: The OpenAI client configuration.
+    :type cfg: OpenAIConfig
+    :return: The sync and async HTTP clients.
+    :rtype: tuple[httpx.Client, httpx.AsyncClient]
+    """
+    try:
+        import h2  # noqa: F401
+
+        http2 = True
+    except ImportError:
+        http2 = False
+    kwargs = {
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=cfg.max_connections,
+            max_keepalive_connections=cfg.max_keepalive_connections,
+            keepalive_expiry=30.0,
+        ),
+        "timeout": httpx.Timeout(60.0, connect=10.0),
+    }
+    if cfg.proxy is not None:
+        kwargs["proxy"] = cfg.proxy
+    return httpx.Client(**kwargs), httpx.AsyncClient(**kwargs)
 
 
 @dataclass
@@ -58,9 +125,15 @@ class OpenAIGeneratorConfig(OpenAIConfig):
 
     :param allow_parallel: Whether to allow parallel generation. Default is True.
     :type allow_parallel: bool
+    :param max_concurrency: The maximum number of concurrent asynchronous requests. Default is 64.
+    :type max_concurrency: int
+    :param batch_size: The number of prefixes sent per legacy completions request. Default is 20.
+    :type batch_size: int
     """
 
     allow_parallel: bool = True
+    max_concurrency: int = 64
+    batch_size: int = 20
 
 
 @dataclass
@@ -69,23 +142,30 @@ class OpenAIEncoderConfig(OpenAIConfig):
 
     :param is_azure: Whether the model is hosted on Azure. Default is False.
     :type is_azure: bool
+    :param max_concurrency: The maximum number of concurrent asynchronous requests. Default is 64.
+    :type max_concurrency: int
+    :param batch_size: The number of texts sent per embeddings request. Default is 256.
+    :type batch_size: int
+    :param cache_size: The maximum number of embeddings kept in the in-memory cache.
+        Set to 0 to disable caching. Default is 10000.
+    :type cache_size: int
     """
 
     dimension: Optional[int] = None
+    max_concurrency: int = 64
+    batch_size: int = 256
+    cache_size: int = 10000
 
 
 @GENERATORS("openai", config_class=OpenAIGeneratorConfig)
 class OpenAIGenerator(GeneratorBase):
     def __init__(self, cfg: OpenAIGeneratorConfig) -> None:
-        from openai import OpenAI, AzureOpenAI
-
-        # prepare proxy
-        if cfg.proxy is not None:
-            httpx_client = httpx.Client(proxies=cfg.proxy)
-        else:
-            httpx_client = None
+        # prepare the underlying HTTP clients
+        httpx_client, async_httpx_client = _prepare_httpx_clients(cfg)
 
         # prepare client
+        # the async client awaits the API directly on the event loop,
+        # instead of hopping every request through a worker thread
         if cfg.is_azure:
             self.client = AzureOpenAI(
                 api_key=cfg.api_key,
@@ -93,22 +173,45 @@ class OpenAIGenerator(GeneratorBase):
                 azure_endpoint=cfg.base_url,
                 http_client=httpx_client,
             )
+            self.async_client = AsyncAzureOpenAI(
+                api_key=cfg.api_key,
+                api_version=cfg.api_version,
+                azure_endpoint=cfg.base_url,
+                http_client=async_httpx_client,
+            )
         else:
             self.client = OpenAI(
                 api_key=cfg.api_key,
                 base_url=cfg.base_url,
                 http_client=httpx_client,
             )
+            self.async_client = AsyncOpenAI(
+                api_key=cfg.api_key,
+                base_url=cfg.base_url,
+                http_client=async_httpx_client,
+            )
 
         # set logger
         self.allow_parallel = cfg.allow_parallel
+        self.max_concurrency = cfg.max_concurrency
+        self.batch_size = cfg.batch_size
+        self._semaphore: Optional[
+            tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]
+        ] = None
         self.model_name = cfg.model_name
+        # constant per instance; computed once instead of on every request
+        if "llama-3" in cfg.model_name.lower():
+            self._extra_body = {"stop_token_ids": [128009]}  # hotfix for llama-3
+        else:
+            self._extra_body = None
+        self._client_identity = (cfg.base_url, cfg.api_key)
         if not cfg.verbose:
             logger = logging.getLogger("httpx")
             logger.setLevel(logging.WARNING)
 
         # check client
-        self._check()
+        if cfg.verify_model:
+            self._check()
         return
 
     @TIME_METER("openai_generate")
@@ -119,8 +222,8 @@ class OpenAIGenerator(GeneratorBase):
     ) -> list[list[str]]:
         gen_cfg = self._get_options(generation_config)
         if self.allow_parallel:
-            with ThreadPoolExecutor() as pool:
-                responses = pool.map(
+            responses = list(
+                _OPENAI_POOL.map(
                     lambda prompt: [
                         r.message.content
                         for r in self.client.chat.completions.create(
@@ -131,7 +234,7 @@ class OpenAIGenerator(GeneratorBase):
                     ],
                     prompts,
                 )
-                responses = list(responses)
+            )
         else:
             responses = []
             for prompt in prompts:
@@ -152,21 +255,19 @@ class OpenAIGenerator(GeneratorBase):
     ) -> list[list[str]]:
         if not isinstance(prompts, list):
             prompts = [prompts]
-        tasks = []
         gen_cfg = self._get_options(generation_config)
-        for prompt in prompts:
-            prompt = prompt.to_list()
-            tasks.append(
-                asyncio.create_task(
-                    asyncio.to_thread(
-                        self.client.chat.completions.create,
-                        model=self.model_name,
-                        messages=prompt,
-                        **gen_cfg,
-                    )
+        semaphore = self._get_semaphore()
+
+        async def chat_one(prompt: ChatPrompt):
+            async with semaphore:
+                return await self.async_client.chat.completions.create(
+                    model=self.model_name,
+                    messages=prompt.to_list(),
+                    **gen_cfg,
                 )
-            )
-        responses = [[i.message.content for i in (await r).choices] for r in tasks]
+
+        results = await asyncio.gather(*(chat_one(prompt) for prompt in prompts))
+        responses = [[i.message.content for i in r.choices] for r in results]
         return responses
 
     @TIME_METER("openai_generate")
@@ -178,30 +279,31 @@ class OpenAIGenerator(GeneratorBase):
         if not isinstance(prefixes, list):
             prefixes = [prefixes]
         gen_cfg = self._get_options(generation_config)
-        if self.allow_parallel:
-            with ThreadPoolExecutor() as pool:
-                responses = pool.map(
-                    lambda prefix: [
-                        r.text
-                        for r in self.client.completions.create(
-                            model=self.model_name,
-                            prompt=prefix,
-                            **gen_cfg,
-                        ).choices
-                    ],
-                    prefixes,
-                )
-                responses = list(responses)
+        sample_num = gen_cfg["n"]
+        # unlike chat, the legacy completions endpoint accepts several
+        # prompts per request, so a whole chunk costs one round-trip
+        chunks = [
+            prefixes[i : i + self.batch_size]
+            for i in range(0, len(prefixes), self.batch_size)
+        ]
+
+        def generate_chunk(chunk: list[str]) -> list[list[str]]:
+            response = self.client.completions.create(
+                model=self.model_name,
+                prompt=chunk,
+                **gen_cfg,
+            )
+            # the choices for prompt `i` carry indices in [i * n, (i + 1) * n)
+            chunk_responses = [[] for _ in chunk]
+            for choice in response.choices:
+                chunk_responses[choice.index // sample_num].append(choice.text)
+            return chunk_responses
+
+        if self.allow_parallel and (len(chunks) > 1):
+            results = list(_OPENAI_POOL.map(generate_chunk, chunks))
         else:
-            responses = []
-            for prefix in prefixes:
-                response = self.client.completions.create(
-                    model=self.model_name,
-                    prompt=prefix,
-                    **gen_cfg,
-                )
-                responses.append([i.text for i in response.choices])
-        return responses
+            results = [generate_chunk(chunk) for chunk in chunks]
+        return [response for chunk in results for response in chunk]
 
     @TIME_METER("openai_generate")
     async def async_generate(
@@ -211,27 +313,23 @@ class OpenAIGenerator(GeneratorBase):
     ) -> list[list[str]]:
         if not isinstance(prefixes, list):
             prefixes = [prefixes]
-        tasks = []
         gen_cfg = self._get_options(generation_config)
-        for prefix in prefixes:
-            tasks.append(
-                asyncio.create_task(
-                    asyncio.to_thread(
-                        self.client.completions.create,
-                        model=self.model_name,
-                        prompt=prefix,
-                        **gen_cfg,
-                    )
+        semaphore = self._get_semaphore()
+
+        async def generate_one(prefix: str):
+            async with semaphore:
+                return await self.async_client.completions.create(
+                    model=self.model_name,
+                    prompt=prefix,
+                    **gen_cfg,
                 )
-            )
-        responses = [[i.text for i in (await r).choices] for r in tasks]
+
+        results = await asyncio.gather(*(generate_one(prefix) for prefix in prefixes))
+        responses = [[i.text for i in r.choices] for r in results]
         return responses
 
     def _get_options(self, generation_config: GenerationConfig) -> dict:
-        if "llama-3" in self.model_name.lower():
-            extra_body = {"stop_token_ids": [128009]}  # hotfix for llama-3
-        else:
-            extra_body = None
+        stop_str = generation_config.stop_str
         return {
             "temperature": (
                 generation_config.temperature if generation_config.do_sample else 0.0
@@ -239,25 +337,32 @@ class OpenAIGenerator(GeneratorBase):
             "max_tokens": generation_config.max_new_tokens,
             "top_p": generation_config.top_p,
             "n": generation_config.sample_num,
-            "extra_body": extra_body,
-            "stop": list(generation_config.stop_str),
+            "extra_body": self._extra_body,
+            "stop": stop_str if isinstance(stop_str, list) else list(stop_str),
         }
 
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # a semaphore binds to the loop that first awaits it, so the
+        # cached one is keyed by the running loop and recreated whenever
+        # the loop changes (e.g. successive asyncio.run calls)
+        loop = asyncio.get_running_loop()
+        if (self._semaphore is None) or (self._semaphore[0] is not loop):
+            self._semaphore = (loop, asyncio.Semaphore(self.max_concurrency))
+        return self._semaphore[1]
+
     def _check(self):
-        model_lists = [i.id for i in self.client.models.list().data]
-        assert self.model_name in model_lists, f"Model {self.model_name} not found"
+        models = _MODELS_CACHE.get(self._client_identity)
+        if models is None:
+            models = {i.id for i in self.client.models.list().data}
+            _MODELS_CACHE[self._client_identity] = models
+        assert self.model_name in models, f"Model {self.model_name} not found"
 
 
 @ENCODERS("openai", config_class=OpenAIEncoderConfig)
 class OpenAIEncoder(EncoderBase):
     def __init__(self, cfg: OpenAIEncoderConfig) -> None:
-        from openai import OpenAI, AzureOpenAI
-
-        # prepare proxy
-        if cfg.proxy is not None:
-            httpx_client = httpx.Client(proxies=cfg.proxy)
-        else:
-            httpx_client = None
+        # prepare the underlying HTTP clients
+        httpx_client, async_httpx_client = _prepare_httpx_clients(cfg)
 
         # prepare client
         if cfg.is_azure:
@@ -267,45 +372,165 @@ class OpenAIEncoder(EncoderBase):
                 azure_endpoint=cfg.base_url,
                 http_client=httpx_client,
             )
+            self.async_client = AsyncAzureOpenAI(
+                api_key=cfg.api_key,
+                api_version=cfg.api_version,
+                azure_endpoint=cfg.base_url,
+                http_client=async_httpx_client,
+            )
         else:
             self.client = OpenAI(
                 api_key=cfg.api_key,
                 base_url=cfg.base_url,
                 http_client=httpx_client,
             )
+            self.async_client = AsyncOpenAI(
+                api_key=cfg.api_key,
+                base_url=cfg.base_url,
+                http_client=async_httpx_client,
+            )
 
         # set logger
         self.model_name = cfg.model_name
         self.dimension = cfg.dimension
+        self.max_concurrency = cfg.max_concurrency
+        self.batch_size = cfg.batch_size
+        self._semaphore: Optional[
+            tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]
+        ] = None
+        # LRU cache mapping hashed (model, dimension, text) keys to embeddings
+        self.cache_size = cfg.cache_size
+        self._cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._client_identity = (cfg.base_url, cfg.api_key)
         if not cfg.verbose:
             logger = logging.getLogger("httpx")
             logger.setLevel(logging.WARNING)
 
         # check client
-        self._check()
+        if cfg.verify_model:
+            self._check()
         return
 
     @TIME_METER("openai_encode")
     def _encode(self, texts: list[str]) -> np.ndarray:
-        if self.dimension is None:
-            r = self.client.embeddings.create(model=self.model_name, input=texts)
-        else:
-            r = self.client.embeddings.create(
-                model=self.model_name, input=texts, dimensions=self.dimension
-            )
-        embeddings = [i.embedding for i in r.data]
-        return np.array(embeddings)
+        # only the cache misses are forwarded to the API
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = [self._cache_lookup(key) for key in keys]
+        miss_indices = [i for i, emb in enumerate(embeddings) if emb is None]
+        if miss_indices:
+            fetched = self._request_embeddings([texts[i] for i in miss_indices])
+            for i, embedding in zip(miss_indices, fetched):
+                embeddings[i] = embedding
+                self._cache_store(keys[i], embedding)
+        return np.stack(embeddings)
 
     @TIME_METER("openai_encode")
     async def async_encode(self, texts: list[str]) -> np.ndarray:
-        r = await asyncio.to_thread(
-            self.client.embeddings.create,
-            model=self.model_name,
-            input=texts,
-            dimensions=self.dimension,
-        )
-        embeddings = [i.embedding for i in r.data]
-        return np.array(embeddings)
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = [self._cache_lookup(key) for key in keys]
+        miss_indices = [i for i, emb in enumerate(embeddings) if emb is None]
+        if miss_indices:
+            fetched = await self._async_request_embeddings(
+                [texts[i] for i in miss_indices]
+            )
+            for i, embedding in zip(miss_indices, fetched):
+                embeddings[i] = embedding
+                self._cache_store(keys[i], embedding)
+        return np.stack(embeddings)
+
+    def _request_embeddings(self, texts: list[str]) -> np.ndarray:
+        # the embeddings endpoint caps the size of the input array,
+        # so the texts are chunked and the requests issued concurrently
+        chunks = [
+            texts[i : i + self.batch_size]
+            for i in range(0, len(texts), self.batch_size)
+        ]
+
+        def encode_chunk(chunk: list[str]) -> np.ndarray:
+            if self.dimension is None:
+                r = self.client.embeddings.create(
+                    model=self.model_name, input=chunk, encoding_format="base64"
+                )
+            else:
+                r = self.client.embeddings.create(
+                    model=self.model_name,
+                    input=chunk,
+                    dimensions=self.dimension,
+                    encoding_format="base64",
+                )
+            return self._decode_embeddings(r.data)
+
+        if len(chunks) > 1:
+            results = list(_OPENAI_POOL.map(encode_chunk, chunks))
+        else:
+            results = [encode_chunk(chunk) for chunk in chunks]
+        return np.vstack(results)
+
+    async def _async_request_embeddings(self, texts: list[str]) -> np.ndarray:
+        chunks = [
+            texts[i : i + self.batch_size]
+            for i in range(0, len(texts), self.batch_size)
+        ]
+
+        async def encode_chunk(chunk: list[str]) -> np.ndarray:
+            async with self._get_semaphore():
+                if self.dimension is None:
+                    r = await self.async_client.embeddings.create(
+                        model=self.model_name, input=chunk, encoding_format="base64"
+                    )
+                else:
+                    r = await self.async_client.embeddings.create(
+                        model=self.model_name,
+                        input=chunk,
+                        dimensions=self.dimension,
+                        encoding_format="base64",
+                    )
+            return self._decode_embeddings(r.data)
+
+        results = await asyncio.gather(*(encode_chunk(chunk) for chunk in chunks))
+        return np.vstack(results)
+
+    @staticmethod
+    def _decode_embeddings(data: list) -> np.ndarray:
+        # with encoding_format="base64" each embedding arrives as a compact
+        # base64 blob that decodes straight into a float32 row, skipping the
+        # per-float PyFloat boxing of the json list representation; servers
+        # that ignore the parameter still return plain float lists
+        first = data[0].embedding
+        if isinstance(first, str):
+            return np.stack(
+                [
+                    np.frombuffer(b64decode(item.embedding), dtype=np.float32)
+                    for item in data
+                ]
+            )
+        return np.asarray([item.embedding for item in data], dtype=np.float32)
+
+    def _cache_key(self, text: str) -> bytes:
+        return sha256(f"{self.model_name}\0{self.dimension}\0{text}".encode()).digest()
+
+    def _cache_lookup(self, key: bytes) -> Optional[np.ndarray]:
+        embedding = self._cache.get(key)
+        if embedding is not None:
+            self._cache.move_to_end(key)
+        return embedding
+
+    def _cache_store(self, key: bytes, embedding: np.ndarray) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = embedding
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # a semaphore binds to the loop that first awaits it, so the
+        # cached one is keyed by the running loop and recreated whenever
+        # the loop changes (e.g. successive asyncio.run calls)
+        loop = asyncio.get_running_loop()
+        if (self._semaphore is None) or (self._semaphore[0] is not loop):
+            self._semaphore = (loop, asyncio.Semaphore(self.max_concurrency))
+        return self._semaphore[1]
 
     @property
     def embedding_size(self):
@@ -318,5 +543,8 @@ class OpenAIEncoder(EncoderBase):
         return self.dimension
 
     def _check(self):
-        model_lists = [i.id for i in self.client.models.list().data]
-        assert self.model_name in model_lists, f"Model {self.model_name} not found"
+        models = _MODELS_CACHE.get(self._client_identity)
+        if models is None:
+            models = {i.id for i in self.client.models.list().data}
+            _MODELS_CACHE[self._client_identity] = models
+        assert self.model_name in models, f"Model {self.model_name} not found"
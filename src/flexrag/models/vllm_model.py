@@ -42,6 +42,9 @@ class VLLMGeneratorConfig:
 
 @GENERATORS("vllm", config_class=VLLMGeneratorConfig)
 class VLLMGenerator(GeneratorBase):
+    # vLLM accepts one SamplingParams per prompt in a single generate call
+    support_batched_generation_config = True
+
     def __init__(self, cfg: VLLMGeneratorConfig) -> None:
         from vllm import LLM
 
@@ -65,6 +68,7 @@ class VLLMGenerator(GeneratorBase):
             max_model_len=max_length,
             trust_remote_code=cfg.trust_remote_code,
             enforce_eager=True if cfg.use_minference else False,
+            enable_prefix_caching=True,  # reuse KV cache for shared prefixes
         )
         self.tokenizer = self.model.get_tokenizer()
         self.template = load_template(model_name=model_name, tokenizer=self.tokenizer)
@@ -81,17 +85,31 @@ class VLLMGenerator(GeneratorBase):
                 logger.warning("Fallback to normal mode.")
         return
 
+    def _tokenize(self, prefixes: list[str], add_special_tokens: bool = True) -> list:
+        # tokenize outside vLLM so the prompts are not re-tokenized
+        # internally; the chat path passes add_special_tokens=False because
+        # its rendered templates already contain the special tokens, while
+        # raw prefixes keep the default BOS handling
+        from vllm import TokensPrompt
+
+        token_ids = self.tokenizer(
+            prefixes, add_special_tokens=add_special_tokens
+        ).input_ids
+        return [TokensPrompt(prompt_token_ids=ids) for ids in token_ids]
+
     @TIME_METER("vllm_generate")
     def _generate(
         self,
         prefixes: list[str],
-        generation_config: GenerationConfig = GenerationConfig(),
+        generation_config: (
+            GenerationConfig | list[GenerationConfig]
+        ) = GenerationConfig(),
     ) -> list[list[str]]:
         if not isinstance(prefixes, list):
             prefixes = [prefixes]
         responses = self.model.generate(
-            prefixes,
-            sampling_params=self._get_options(generation_config),
+            self._tokenize(prefixes),
+            sampling_params=self._get_sampling_params(generation_config),
             use_tqdm=False,
         )
         responses = [[i.text for i in resp.outputs] for resp in responses]
@@ -100,34 +118,62 @@ class VLLMGenerator(GeneratorBase):
     async def async_generate(
         self,
         prefixes: list[str],
-        generation_config: GenerationConfig = GenerationConfig(),
+        generation_config: (
+            GenerationConfig | list[GenerationConfig]
+        ) = GenerationConfig(),
     ) -> list[list[str]]:
         if not isinstance(prefixes, list):
             prefixes = [prefixes]
         responses = await asyncio.to_thread(
             self.model.generate,
-            prefixes,
-            sampling_params=self._get_options(generation_config),
+            self._tokenize(prefixes),
+            sampling_params=self._get_sampling_params(generation_config),
             use_tqdm=False,
         )
         responses = [[i.text for i in resp.outputs] for resp in responses]
         return responses
 
+    @TIME_METER("vllm_generate")
     def _chat(
         self,
         prompts: list[ChatPrompt],
-        generation_config: GenerationConfig = GenerationConfig(),
+        generation_config: (
+            GenerationConfig | list[GenerationConfig]
+        ) = GenerationConfig(),
     ) -> list[list[str]]:
         prefixes = [self.template.render_to_text(prompt) for prompt in prompts]
-        return self.generate(prefixes, generation_config)
+        responses = self.model.generate(
+            self._tokenize(prefixes, add_special_tokens=False),
+            sampling_params=self._get_sampling_params(generation_config),
+            use_tqdm=False,
+        )
+        responses = [[i.text for i in resp.outputs] for resp in responses]
+        return responses
 
+    @TIME_METER("vllm_generate")
     async def async_chat(
         self,
         prompts: list[ChatPrompt],
-        generation_config: GenerationConfig = GenerationConfig(),
+        generation_config: (
+            GenerationConfig | list[GenerationConfig]
+        ) = GenerationConfig(),
     ) -> list[list[str]]:
         prefixes = [self.template.render_to_text(prompt) for prompt in prompts]
-        return await self.async_generate(prefixes, generation_config)
+        responses = await asyncio.to_thread(
+            self.model.generate,
+            self._tokenize(prefixes, add_special_tokens=False),
+            sampling_params=self._get_sampling_params(generation_config),
+            use_tqdm=False,
+        )
+        responses = [[i.text for i in resp.outputs] for resp in responses]
+        return responses
+
+    def _get_sampling_params(
+        self, generation_config: GenerationConfig | list[GenerationConfig]
+    ):
+        if isinstance(generation_config, list):
+            return [self._get_options(cfg) for cfg in generation_config]
+        return self._get_options(generation_config)
 
     def _get_options(self, generation_config: GenerationConfig):
         from vllm import SamplingParams
@@ -1,16 +1,16 @@
 import base64
-import json
 from dataclasses import dataclass, field
 from io import BytesIO
 from os import PathLike
 from typing import Optional
 
+import orjson
 from PIL.Image import Image
 
 from flexrag.utils import Choices
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChatTurn:
     role: Choices(["user", "assistant", "system"])  # type: ignore
     content: str
@@ -124,8 +124,8 @@ class ChatPrompt:
             data["history"].append(turn.to_dict())
         for demo in self.demonstrations:
             data["demonstrations"].append([turn.to_dict() for turn in demo])
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str))
         return
 
     @classmethod
@@ -139,8 +139,8 @@ class ChatPrompt:
 
     @classmethod
     def from_json(cls, path: str | PathLike) -> "ChatPrompt":
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
         if isinstance(data, list):
             return cls.from_list(data)
         return cls(
@@ -153,13 +153,30 @@ class ChatPrompt:
         )
 
     def load_demonstrations(self, demo_path: str | PathLike):
-        with open(demo_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(demo_path, "rb") as f:
+            data = orjson.loads(f.read())
         self.demonstrations = [
             [ChatTurn.from_dict(turn) for turn in demo] for demo in data
         ]
         return
 
+    def copy(self) -> "ChatPrompt":
+        """Return a cheap copy of this prompt for appending new turns.
+
+        The system turn and the demonstrations are shared with the original
+        prompt (the turns are treated as immutable), while the history list is
+        copied so that updating the returned prompt does not affect the
+        original one.
+
+        :return: The copied ChatPrompt.
+        :rtype: ChatPrompt
+        """
+        return ChatPrompt(
+            system=self.system,
+            history=list(self.history),
+            demonstrations=self.demonstrations,
+        )
+
     def pop_history(self, n: int) -> ChatTurn:
         return self.history.pop(n)
 
@@ -249,8 +266,8 @@ class MultiModelChatPrompt:
             data["history"].append(turn.to_dict())
         for demo in self.demonstrations:
             data["demonstrations"].append([turn.to_dict() for turn in demo])
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str))
         return
 
     @classmethod
@@ -264,8 +281,8 @@ class MultiModelChatPrompt:
 
     @classmethod
     def from_json(cls, path: str | PathLike) -> "ChatPrompt":
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
         if isinstance(data, list):
             return cls.from_list(data)
         return cls(
@@ -288,13 +305,30 @@ class MultiModelChatPrompt:
         return images
 
     def load_demonstrations(self, demo_path: str | PathLike):
-        with open(demo_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(demo_path, "rb") as f:
+            data = orjson.loads(f.read())
         self.demonstrations = [
             [MultiModelChatTurn.from_dict(turn) for turn in demo] for demo in data
         ]
         return
 
+    def copy(self) -> "MultiModelChatPrompt":
+        """Return a cheap copy of this prompt for appending new turns.
+
+        The system turn and the demonstrations are shared with the original
+        prompt (the turns are treated as immutable), while the history list is
+        copied so that updating the returned prompt does not affect the
+        original one.
+
+        :return: The copied MultiModelChatPrompt.
+        :rtype: MultiModelChatPrompt
+        """
+        return MultiModelChatPrompt(
+            system=self.system,
+            history=list(self.history),
+            demonstrations=self.demonstrations,
+        )
+
     def pop_history(self, n: int) -> MultiModelChatTurn:
         return self.history.pop(n)
 
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from copy import deepcopy
+from collections import OrderedDict
+from copy import copy
 from functools import partial
 from typing import Optional
 
@@ -36,8 +37,38 @@ class ChatTemplate(ABC):
     ):
         return
 
+    def render_batch_to_ids(
+        self,
+        prompts: list[ChatPrompt],
+        max_length: int = None,
+        truncation: Choices(TRUNCATION_STRATEGIES) = "auto",  # type: ignore
+        padding: bool = False,
+        has_label: bool = False,
+        add_generation_prompt: bool = True,
+    ) -> list:
+        """Render a batch of prompts to token ids.
+        Subclasses may override this method to tokenize the whole batch at once.
+        """
+        return [
+            self.render_to_ids(
+                prompt,
+                max_length=max_length,
+                truncation=truncation,
+                padding=padding,
+                has_label=has_label,
+                add_generation_prompt=add_generation_prompt,
+            )
+            for prompt in prompts
+        ]
+
 
 class HFTemplate(ChatTemplate):
+    # rendered prompts cached per template instance (see `render_to_text`)
+    RENDER_CACHE_SIZE = 128
+    # static prefixes (system prompt + demonstrations) cached as token ids
+    # per template instance (see `_encode_static_prefix`)
+    PREFIX_CACHE_SIZE = 32
+
     def __init__(
         self,
         tokenizer: PreTrainedTokenizer,
@@ -48,6 +79,34 @@ class HFTemplate(ChatTemplate):
         self.tokenizer = tokenizer
         self.sys_prompt = sys_prompt
         self.chat_template = chat_template
+        self._render_cache: OrderedDict[tuple, str] = OrderedDict()
+        self._prefix_cache: OrderedDict[tuple, tuple[str, list[int]]] = OrderedDict()
+        # pre-compile the custom Jinja template once, as `apply_chat_template`
+        # pays a Python-level compilation/lookup cost on every call
+        self._compiled_template = None
+        if chat_template is not None:
+            compile_template = getattr(tokenizer, "_compile_jinja_template", None)
+            if compile_template is not None:
+                try:
+                    self._compiled_template = compile_template(chat_template)
+                except Exception:
+                    self._compiled_template = None
+        # pre-configured handles per truncation side; mutating
+        # tokenizer.truncation_side on every call is not thread-safe and
+        # invalidates the fast tokenizer's cached settings. The shallow
+        # copies share the underlying (Rust) tokenizer state.
+        self._tokenizers = {"left": copy(tokenizer), "right": copy(tokenizer)}
+        self._tokenizers["left"].truncation_side = "left"
+        self._tokenizers["right"].truncation_side = "right"
+        # dict dispatch is cheaper than sequential match/case comparisons
+        # on the per-prompt render path
+        self._trunc_handlers = {
+            "left": self._trunc_left,
+            "right": self._trunc_right,
+            "history": self._trunc_history,
+            "demo": self._trunc_demo,
+            "auto": self._trunc_auto,
+        }
         return
 
     def render_to_text(
@@ -61,15 +120,241 @@ class HFTemplate(ChatTemplate):
             prompt_.append({"role": "system", "content": self.sys_prompt})
         if (prompt_[0]["role"] != "system") and (self.sys_prompt is not None):
             prompt_.insert(0, {"role": "system", "content": self.sys_prompt})
-        # apply template
-        prefix = self.tokenizer.apply_chat_template(
-            prompt_,
-            tokenize=False,
-            chat_template=self.chat_template,
-            add_generation_prompt=add_generation_prompt,
+        # memoize the rendered prompt, as re-rendering the Jinja template is
+        # expensive and the same prompt is often rendered repeatedly
+        # (e.g. static system prompt + demonstrations in eval sweeps)
+        key = (
+            tuple((turn["role"], turn["content"]) for turn in prompt_),
+            add_generation_prompt,
         )
+        if key in self._render_cache:
+            self._render_cache.move_to_end(key)
+            return self._render_cache[key]
+        # apply template
+        if self._compiled_template is not None:
+            prefix = self._compiled_template.render(
+                messages=prompt_,
+                add_generation_prompt=add_generation_prompt,
+                **self.tokenizer.special_tokens_map,
+            )
+        else:
+            prefix = self.tokenizer.apply_chat_template(
+                prompt_,
+                tokenize=False,
+                chat_template=self.chat_template,
+                add_generation_prompt=add_generation_prompt,
+            )
+        self._render_cache[key] = prefix
+        if len(self._render_cache) > self.RENDER_CACHE_SIZE:
+            self._render_cache.popitem(last=False)
         return prefix
 
+    def _encode_static_prefix(
+        self, prompt: ChatPrompt
+    ) -> Optional[tuple[str, list[int]]]:
+        """Return the rendered text and token ids of the static part of the
+        prompt (system prompt + demonstrations), cached across calls. The
+        prefix rarely changes between requests, so its tokenization can be
+        reused and only the dynamic tail needs to be encoded."""
+        if (prompt.system is None) and (len(prompt.demonstrations) == 0):
+            return None
+        key = (
+            None if prompt.system is None else prompt.system.content,
+            tuple(
+                (turn.role, turn.content)
+                for demo in prompt.demonstrations
+                for turn in demo
+            ),
+        )
+        cached = self._prefix_cache.get(key)
+        if cached is not None:
+            self._prefix_cache.move_to_end(key)
+            return cached
+        prefix_prompt = ChatPrompt(
+            system=prompt.system, demonstrations=prompt.demonstrations
+        )
+        prefix_text = self.render_to_text(prefix_prompt, add_generation_prompt=False)
+        prefix_ids = self.tokenizer(prefix_text)["input_ids"]
+        self._prefix_cache[key] = (prefix_text, prefix_ids)
+        if len(self._prefix_cache) > self.PREFIX_CACHE_SIZE:
+            self._prefix_cache.popitem(last=False)
+        return (prefix_text, prefix_ids)
+
+    def _encode(
+        self,
+        prompt: ChatPrompt,
+        add_generation_prompt: bool = True,
+        padding: bool = False,
+        max_length: Optional[int] = None,
+        truncation: bool = False,
+        truncation_side: str = "left",
+    ) -> list[int]:
+        prefix = self.render_to_text(prompt, add_generation_prompt)
+        ids = self._tokenizers[truncation_side](
+            prefix,
+            max_length=max_length,
+            padding=padding,
+            truncation=truncation,
+        )["input_ids"]
+        return ids
+
+    def _pick_first_fit(
+        self,
+        variants: list[ChatPrompt],
+        max_length: int,
+        padding: bool,
+        add_generation_prompt: bool,
+    ) -> Optional[list[int]]:
+        # tokenize all truncated variants in one batched call and return
+        # the ids of the first (least truncated) variant that fits; the
+        # lengths are monotonically decreasing, so this is equivalent to
+        # re-encoding inside a loop but costs a single tokenizer call
+        if len(variants) == 0:
+            return None
+        texts = [self.render_to_text(p, add_generation_prompt) for p in variants]
+        # tokenize without padding so every variant reports its own length;
+        # padding the batch would inflate all lengths to the longest variant
+        # and no candidate would ever fit
+        ids_list = self.tokenizer(texts, padding=False)["input_ids"]
+        for text, ids in zip(texts, ids_list):
+            if len(ids) <= max_length:
+                if padding:
+                    # pad only the selected variant, as the per-variant
+                    # encode did before batching
+                    return self.tokenizer(text, padding=padding)["input_ids"]
+                return ids
+        return None
+
+    def _trunc_left(
+        self,
+        prompt: ChatPrompt,
+        max_length: int,
+        padding: bool,
+        add_generation_prompt: bool,
+    ) -> list[int]:
+        return self._encode(
+            prompt,
+            add_generation_prompt,
+            padding,
+            max_length=max_length,
+            truncation=True,
+            truncation_side="left",
+        )
+
+    def _trunc_right(
+        self,
+        prompt: ChatPrompt,
+        max_length: int,
+        padding: bool,
+        add_generation_prompt: bool,
+    ) -> list[int]:
+        return self._encode(
+            prompt,
+            add_generation_prompt,
+            padding,
+            max_length=max_length,
+            truncation=True,
+            truncation_side="right",
+        )
+
+    def _trunc_history(
+        self,
+        prompt: ChatPrompt,
+        max_length: int,
+        padding: bool,
+        add_generation_prompt: bool,
+    ) -> list[int]:
+        ids = self._encode(prompt, add_generation_prompt, padding)
+        if len(ids) > max_length:
+            ids = self._pick_first_fit(
+                [
+                    ChatPrompt(
+                        system=prompt.system,
+                        history=prompt.history[n:],
+                        demonstrations=prompt.demonstrations,
+                    )
+                    for n in range(2, len(prompt.history) + 1, 2)
+                ],
+                max_length,
+                padding,
+                add_generation_prompt,
+            )
+            if ids is None:
+                raise ValueError(
+                    "Unable to truncate the prompt using `history` strategy."
+                )
+        return ids
+
+    def _trunc_demo(
+        self,
+        prompt: ChatPrompt,
+        max_length: int,
+        padding: bool,
+        add_generation_prompt: bool,
+    ) -> list[int]:
+        ids = self._encode(prompt, add_generation_prompt, padding)
+        if len(ids) > max_length:
+            ids = self._pick_first_fit(
+                [
+                    ChatPrompt(
+                        system=prompt.system,
+                        history=prompt.history,
+                        demonstrations=prompt.demonstrations[n:],
+                    )
+                    for n in range(1, len(prompt.demonstrations) + 1)
+                ],
+                max_length,
+                padding,
+                add_generation_prompt,
+            )
+            if ids is None:
+                raise ValueError(
+                    "Unable to truncate the prompt using `demo` strategy."
+                )
+        return ids
+
+    def _trunc_auto(
+        self,
+        prompt: ChatPrompt,
+        max_length: int,
+        padding: bool,
+        add_generation_prompt: bool,
+    ) -> list[int]:
+        ids = self._encode(prompt, add_generation_prompt, padding)
+        if len(ids) > max_length:
+            # drop history pairs first, then demonstrations
+            history = prompt.history
+            min_history = history[len(history) - (len(history) % 2) :]
+            variants = [
+                ChatPrompt(
+                    system=prompt.system,
+                    history=history[n:],
+                    demonstrations=prompt.demonstrations,
+                )
+                for n in range(2, len(history) + 1, 2)
+            ] + [
+                ChatPrompt(
+                    system=prompt.system,
+                    history=min_history,
+                    demonstrations=prompt.demonstrations[n:],
+                )
+                for n in range(1, len(prompt.demonstrations) + 1)
+            ]
+            ids = self._pick_first_fit(
+                variants, max_length, padding, add_generation_prompt
+            )
+            if ids is None:
+                # nothing fits: hard-truncate the shortest variant
+                ids = self._encode(
+                    variants[-1] if variants else prompt,
+                    add_generation_prompt,
+                    padding,
+                    max_length=max_length,
+                    truncation=True,
+                    truncation_side="left",
+                )
+        return ids
+
     def render_to_ids(
         self,
         prompt: ChatPrompt,
@@ -79,82 +364,71 @@ class HFTemplate(ChatTemplate):
         has_label: bool = False,  # TODO: support label(mask_input)
         add_generation_prompt: bool = True,
     ) -> list[int] | tuple[list[int], list[int]]:
-        def _encode(
-            prompt: ChatPrompt,
-            max_length: int = None,
-            truncation: bool = False,
-            truncation_side: str = "left",
-        ) -> list[int]:
-            prefix = self.render_to_text(prompt, add_generation_prompt)
-            self.tokenizer.truncation_side = truncation_side
-            ids = self.tokenizer(
-                prefix,
-                max_length=max_length,
-                padding=padding,
-                truncation=truncation,
-            )["input_ids"]
-            return ids
-
         # truncate the prompt
-        prompt = deepcopy(prompt)
         if max_length is not None:
-            match truncation:
-                case "left":
-                    ids = _encode(
-                        prompt,
-                        max_length=max_length,
-                        truncation=True,
-                        truncation_side="left",
-                    )
-                case "right":
-                    ids = _encode(
-                        prompt,
-                        max_length=max_length,
-                        truncation=True,
-                        truncation_side="right",
-                    )
-                case "history":
-                    pre_ids = _encode(prompt)
-                    while len(pre_ids) > max_length:
-                        if len(prompt.history) > 1:
-                            prompt.pop_history(0)
-                            prompt.pop_history(0)
-                        else:
-                            raise ValueError(
-                                "Unable to truncate the prompt using `history` strategy."
-                            )
-                        pre_ids = _encode(prompt)
-                    ids = pre_ids
-                case "demo":
-                    pre_ids = _encode(prompt)
-                    while len(pre_ids) > max_length:
-                        if len(prompt.demonstrations) > 0:
-                            prompt.pop_demonstration(0)
-                        else:
-                            raise ValueError(
-                                "Unable to truncate the prompt using `demo` strategy."
-                            )
-                case "auto":
-                    pre_ids = _encode(prompt)
-                    while len(pre_ids) > max_length:
-                        if len(prompt.history) > 1:
-                            prompt.pop_history(0)
-                            prompt.pop_history(0)
-                            pre_ids = _encode(prompt)
-                        elif len(prompt.demonstrations) > 0:
-                            prompt.pop_demonstration(0)
-                            pre_ids = _encode(prompt)
-                        else:
-                            pre_ids = _encode(
-                                prompt, truncation=True, truncation_side="left"
-                            )
-                    ids = pre_ids
-                case _:
-                    raise ValueError("Unsupported truncation strategy.")
+            handler = self._trunc_handlers.get(truncation)
+            if handler is None:
+                raise ValueError("Unsupported truncation strategy.")
+            ids = handler(prompt, max_length, padding, add_generation_prompt)
         else:
-            ids = _encode(prompt)
+            # no length budget: reuse the cached token ids of the static
+            # prefix and tokenize only the dynamic tail; chat templates end
+            # the prefix at a special-token boundary, so the concatenation
+            # matches a whole-string encode
+            ids = None
+            prefix = self._encode_static_prefix(prompt)
+            if prefix is not None:
+                prefix_text, prefix_ids = prefix
+                full_text = self.render_to_text(prompt, add_generation_prompt)
+                if full_text.startswith(prefix_text):
+                    tail_ids = self.tokenizer(
+                        full_text[len(prefix_text) :], add_special_tokens=False
+                    )["input_ids"]
+                    ids = prefix_ids + tail_ids
+            if ids is None:
+                ids = self._encode(prompt, add_generation_prompt, padding)
         return ids
 
+    def render_batch_to_ids(
+        self,
+        prompts: list[ChatPrompt],
+        max_length: Optional[int] = None,
+        truncation: Choices(TRUNCATION_STRATEGIES) = "auto",  # type: ignore
+        padding: bool = False,
+        has_label: bool = False,
+        add_generation_prompt: bool = True,
+    ) -> list[list[int]]:
+        """Render a batch of prompts with a single tokenizer call.
+        The fast tokenizer parallelizes across the batch, which is much faster
+        than calling ``render_to_ids`` once per prompt.
+        """
+        texts = [self.render_to_text(p, add_generation_prompt) for p in prompts]
+        if max_length is None:
+            return self.tokenizer(texts, padding=padding)["input_ids"]
+        if truncation in ("left", "right"):
+            return self._tokenizers[truncation](
+                texts,
+                max_length=max_length,
+                padding=padding,
+                truncation=True,
+            )["input_ids"]
+        # the pop-based strategies may need to re-render individual prompts,
+        # so batch-encode once and fall back only for those that overflow
+        batch_ids = self.tokenizer(texts)["input_ids"]
+        return [
+            ids
+            if len(ids) <= max_length
+            else self.render_to_ids(
+                prompt,
+                max_length=max_length,
+                truncation=truncation,
+                padding=padding,
+                has_label=has_label,
+                add_generation_prompt=add_generation_prompt,
+            )
+            for prompt, ids in zip(prompts, batch_ids)
+        ]
+
 
 # register default templates
 Llama3Template = partial(
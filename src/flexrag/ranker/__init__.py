@@ -1,21 +1,52 @@
-from .cohere_ranker import CohereRanker, CohereRankerConfig
-from .gpt_ranker import RankGPTRanker, RankGPTRankerConfig
-from .hf_ranker import (
-    HFColBertRanker,
-    HFColBertRankerConfig,
-    HFCrossEncoderRanker,
-    HFCrossEncoderRankerConfig,
-    HFSeq2SeqRanker,
-    HFSeq2SeqRankerConfig,
-)
-from .jina_ranker import JinaRanker, JinaRankerConfig
-from .mixedbread_ranker import MixedbreadRanker, MixedbreadRankerConfig
-from .voyage_ranker import VoyageRanker, VoyageRankerConfig
-
-from .ranker import RankerBase, RankerBaseConfig, RANKERS, RankingResult  # isort: skip
-
-
-RankerConfig = RANKERS.make_config(config_name="RankerConfig", default=None)
+import importlib
+
+from .ranker import RankerBase, RankerBaseConfig, RANKERS, RankingResult
+
+# map each ranker to its module so that importing the package does not pull
+# in the heavy optional dependencies (transformers, cohere, voyageai, ...)
+# of rankers that are never used; the actual import happens on first
+# attribute access (PEP 562)
+_LAZY_IMPORTS = {
+    "CohereRanker": "cohere_ranker",
+    "CohereRankerConfig": "cohere_ranker",
+    "RankGPTRanker": "gpt_ranker",
+    "RankGPTRankerConfig": "gpt_ranker",
+    "HFColBertRanker": "hf_ranker",
+    "HFColBertRankerConfig": "hf_ranker",
+    "HFCrossEncoderRanker": "hf_ranker",
+    "HFCrossEncoderRankerConfig": "hf_ranker",
+    "HFSeq2SeqRanker": "hf_ranker",
+    "HFSeq2SeqRankerConfig": "hf_ranker",
+    "JinaRanker": "jina_ranker",
+    "JinaRankerConfig": "jina_ranker",
+    "MixedbreadRanker": "mixedbread_ranker",
+    "MixedbreadRankerConfig": "mixedbread_ranker",
+    "VoyageRanker": "voyage_ranker",
+    "VoyageRankerConfig": "voyage_ranker",
+}
+
+
+def _import_all() -> None:
+    """Import every ranker module so that all rankers are registered."""
+    for module_name in set(_LAZY_IMPORTS.values()):
+        importlib.import_module(f".{module_name}", __name__)
+    return
+
+
+def __getattr__(name: str):
+    if name == "RankerConfig":
+        # building the config requires every ranker to be registered
+        _import_all()
+        config = RANKERS.make_config(config_name="RankerConfig", default=None)
+        globals()["RankerConfig"] = config
+        return config
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
 
 __all__ = [
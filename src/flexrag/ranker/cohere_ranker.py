@@ -6,6 +6,14 @@ import httpx
 import numpy as np
 from omegaconf import MISSING
 
+try:
+    from cohere import AsyncClient, Client
+except ImportError as e:
+    raise ImportError(
+        "The `cohere` package is required to use the CohereRanker. "
+        "Please install it with `pip install cohere`."
+    ) from e
+
 from flexrag.utils import TIME_METER
 
 from .ranker import RankerBase, RankerBaseConfig, RANKERS
@@ -23,12 +31,15 @@ class CohereRankerConfig(RankerBaseConfig):
     :type api_key: str
     :param proxy: the proxy for the request. Default is None.
     :type proxy: Optional[str]
+    :param max_concurrency: the maximum number of concurrent asynchronous requests. Default is 64.
+    :type max_concurrency: int
     """
 
     model: str = "rerank-multilingual-v3.0"
     base_url: Optional[str] = None
     api_key: str = MISSING
     proxy: Optional[str] = None
+    max_concurrency: int = 64
 
 
 @RANKERS("cohere", config_class=CohereRankerConfig)
@@ -37,16 +48,32 @@ class CohereRanker(RankerBase):
 
     def __init__(self, cfg: CohereRankerConfig) -> None:
         super().__init__(cfg)
-        from cohere import Client
+        try:
+            import h2  # noqa: F401
 
-        if cfg.proxy is not None:
-            httpx_client = httpx.Client(proxies=cfg.proxy)
-        else:
-            httpx_client = None
+            http2 = True
+        except ImportError:
+            http2 = False
+        limits = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
         self.client = Client(
-            api_key=cfg.api_key, base_url=cfg.base_url, httpx_client=httpx_client
+            api_key=cfg.api_key,
+            base_url=cfg.base_url,
+            httpx_client=httpx.Client(proxy=cfg.proxy, limits=limits, http2=http2),
+        )
+        # the async client awaits the API directly on the event loop,
+        # instead of pushing every rerank call through a worker thread
+        self.async_client = AsyncClient(
+            api_key=cfg.api_key,
+            base_url=cfg.base_url,
+            httpx_client=httpx.AsyncClient(
+                proxy=cfg.proxy, limits=limits, http2=http2
+            ),
         )
         self.model = cfg.model
+        self.max_concurrency = cfg.max_concurrency
+        self._semaphore: Optional[
+            tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]
+        ] = None
         return
 
     @TIME_METER("cohere_rank")
@@ -57,19 +84,34 @@ class CohereRanker(RankerBase):
             model=self.model,
             top_n=len(candidates),
         )
-        scores = [i.relevance_score for i in result.results]
+        # build the typed array directly instead of letting np.array infer
+        # the dtype from an intermediate python list
+        scores = np.fromiter(
+            (i.relevance_score for i in result.results),
+            dtype=np.float32,
+            count=len(result.results),
+        )
         return None, scores
 
     @TIME_METER("cohere_rank")
     async def _async_rank(self, query: str, candidates: list[str]):
-        result = await asyncio.create_task(
-            asyncio.to_thread(
-                self.client.rerank,
+        # bound the number of inflight requests to avoid hitting rate limits
+        # when many queries are reranked concurrently
+        # the semaphore binds to the loop that first awaits it, so it is
+        # recreated whenever the running loop changes
+        loop = asyncio.get_running_loop()
+        if (self._semaphore is None) or (self._semaphore[0] is not loop):
+            self._semaphore = (loop, asyncio.Semaphore(self.max_concurrency))
+        async with self._semaphore[1]:
+            result = await self.async_client.rerank(
                 query=query,
                 documents=candidates,
                 model=self.model,
                 top_n=len(candidates),
             )
+        scores = np.fromiter(
+            (i.relevance_score for i in result.results),
+            dtype=np.float32,
+            count=len(result.results),
         )
-        scores = [i.relevance_score for i in result.results]
         return None, scores
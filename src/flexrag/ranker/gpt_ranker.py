@@ -1,4 +1,3 @@
-import copy
 import os
 import re
 from dataclasses import dataclass
@@ -11,6 +10,9 @@ from flexrag.utils import TIME_METER
 
 from .ranker import RANKERS, RankerBase, RankerBaseConfig
 
+# compiled once as the pattern is applied to every ranking response
+_NON_DIGIT_PATTERN = re.compile(r"\D")
+
 
 @dataclass
 class RankGPTRankerConfig(RankerBaseConfig, GeneratorConfig):
@@ -89,7 +91,7 @@ class RankGPTRanker(RankerBase):
         response = self.generator.chat(prompts=[prompt])[0][0]
 
         # convert string to indices
-        response = re.sub(r"\D", " ", response)
+        response = _NON_DIGIT_PATTERN.sub(" ", response)
         indices_ = [int(x) - 1 for x in response.split()]
 
         # deduplicate indices
@@ -113,7 +115,7 @@ class RankGPTRanker(RankerBase):
         response = (await self.generator.async_chat(prompts=[prompt]))[0][0]
 
         # convert string to indices
-        response = re.sub(r"\D", " ", response)
+        response = _NON_DIGIT_PATTERN.sub(" ", response)
         indices_ = [int(x) - 1 for x in response.split()]
 
         # deduplicate indices
@@ -132,12 +134,18 @@ class RankGPTRanker(RankerBase):
 
     def _get_prompt(self, query: str, candidates: list[str]):
         max_length = 300
-        prompt = copy.deepcopy(self.prompt)
-        prompt.history[0].content = prompt.history[0].content.format(
-            query=query, num=len(candidates)
+        # ChatPrompt.copy shares the immutable turns and only copies the
+        # history list, which is much cheaper than a deepcopy per piece
+        prompt = self.prompt.copy()
+        prompt.history[0] = ChatTurn(
+            role=prompt.history[0].role,
+            content=prompt.history[0].content.format(query=query, num=len(candidates)),
         )
         last_turn = prompt.history.pop()
-        last_turn.content = last_turn.content.format(query=query, num=len(candidates))
+        last_turn = ChatTurn(
+            role=last_turn.role,
+            content=last_turn.content.format(query=query, num=len(candidates)),
+        )
 
         rank = 0
         for cand in candidates:
@@ -40,7 +40,7 @@ class MixedbreadRanker(RankerBase):
         from mixedbread_ai.client import MixedbreadAI
 
         if cfg.proxy is not None:
-            httpx_client = httpx.Client(proxies=cfg.proxy)
+            httpx_client = httpx.Client(proxy=cfg.proxy)
         else:
             httpx_client = None
         self.client = MixedbreadAI(
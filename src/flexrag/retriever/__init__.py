@@ -1,6 +1,5 @@
-from .bm25s_retriever import BM25SRetriever, BM25SRetrieverConfig
-from .dense_retriever import DenseRetriever, DenseRetrieverConfig
-from .elastic_retriever import ElasticRetriever, ElasticRetrieverConfig
+import importlib
+
 from .retriever_base import (
     EditableRetriever,
     EditableRetrieverConfig,
@@ -10,23 +9,56 @@ from .retriever_base import (
     LocalRetrieverConfig,
     RETRIEVERS,
 )
-from .typesense_retriever import TypesenseRetriever, TypesenseRetrieverConfig
-from .web_retrievers import (
-    BingRetriever,
-    BingRetrieverConfig,
-    DuckDuckGoRetriever,
-    DuckDuckGoRetrieverConfig,
-    GoogleRetriever,
-    GoogleRetrieverConfig,
-    SerpApiRetriever,
-    SerpApiRetrieverConfig,
-    WikipediaRetriever,
-    WikipediaRetrieverConfig,
-)
-from .hyde_retriever import HydeRetriever, HydeRetrieverConfig
+
+# map each retriever to its module so that importing the package does not
+# pull in the heavy optional dependencies (elasticsearch, typesense, ...)
+# of retrievers that are never used; the actual import happens on first
+# attribute access (PEP 562)
+_LAZY_IMPORTS = {
+    "BM25SRetriever": "bm25s_retriever",
+    "BM25SRetrieverConfig": "bm25s_retriever",
+    "DenseRetriever": "dense_retriever",
+    "DenseRetrieverConfig": "dense_retriever",
+    "ElasticRetriever": "elastic_retriever",
+    "ElasticRetrieverConfig": "elastic_retriever",
+    "TypesenseRetriever": "typesense_retriever",
+    "TypesenseRetrieverConfig": "typesense_retriever",
+    "BingRetriever": "web_retrievers",
+    "BingRetrieverConfig": "web_retrievers",
+    "DuckDuckGoRetriever": "web_retrievers",
+    "DuckDuckGoRetrieverConfig": "web_retrievers",
+    "GoogleRetriever": "web_retrievers",
+    "GoogleRetrieverConfig": "web_retrievers",
+    "SerpApiRetriever": "web_retrievers",
+    "SerpApiRetrieverConfig": "web_retrievers",
+    "WikipediaRetriever": "web_retrievers",
+    "WikipediaRetrieverConfig": "web_retrievers",
+    "HydeRetriever": "hyde_retriever",
+    "HydeRetrieverConfig": "hyde_retriever",
+}
+
+
+def _import_all() -> None:
+    """Import every retriever module so that all retrievers are registered."""
+    for module_name in set(_LAZY_IMPORTS.values()):
+        importlib.import_module(f".{module_name}", __name__)
+    return
 
 
-RetrieverConfig = RETRIEVERS.make_config(config_name="RetrieverConfig", default=None)
+def __getattr__(name: str):
+    if name == "RetrieverConfig":
+        # building the config requires every retriever to be registered
+        _import_all()
+        config = RETRIEVERS.make_config(config_name="RetrieverConfig", default=None)
+        globals()["RetrieverConfig"] = config
+        return config
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
 
 __all__ = [
@@ -93,6 +93,16 @@ class BM25SRetriever(LocalRetriever):
             )
         self._lang = cfg.lang
         self._indexed_fields = cfg.indexed_fields
+
+        # activate the JIT-compiled scorer when numba is available;
+        # bm25s keeps the python scorer as fallback
+        if cfg.backend in ("numba", "auto"):
+            try:
+                import numba  # noqa: F401
+
+                self._retriever.activate_numba_scorer()
+            except (ImportError, AttributeError):
+                pass
         return
 
     @TIME_METER("bm25s_retriever", "add-passages")
@@ -1,9 +1,14 @@
+import itertools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Iterable, Optional
 
+import orjson
 from omegaconf import MISSING
 from elasticsearch import Elasticsearch
+from elasticsearch.helpers import parallel_bulk
+from elasticsearch.serializer import JsonSerializer
 
 from flexrag.common_dataclass import Context, RetrievedContext
 from flexrag.utils import SimpleProgressLogger, LOGGER_MANAGER, TIME_METER
@@ -13,6 +18,45 @@ from .retriever_base import RETRIEVERS, EditableRetriever, EditableRetrieverConf
 logger = LOGGER_MANAGER.get_logger("flexrag.retrievers.elastic")
 
 
+class _OrjsonSerializer(JsonSerializer):
+    """A drop-in JSON serializer for the Elasticsearch client backed by orjson,
+    which encodes/decodes the dict-heavy bulk and msearch payloads much faster
+    than the stdlib json module used by default."""
+
+    def loads(self, data: bytes):
+        return orjson.loads(data)
+
+    def dumps(self, data) -> bytes:
+        return orjson.dumps(
+            data, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+class _OrjsonNdjsonSerializer(_OrjsonSerializer):
+    """orjson-backed serializer for the newline-delimited bodies used by the
+    bulk and msearch endpoints, which the default client serializes line by
+    line with the stdlib json module regardless of the ``serializer`` option."""
+
+    mimetype = "application/x-ndjson"
+
+    def loads(self, data: bytes) -> list:
+        return [orjson.loads(line) for line in data.splitlines() if line]
+
+    def dumps(self, data) -> bytes:
+        buf = bytearray()
+        for item in data:
+            if isinstance(item, bytes):
+                buf += item
+            elif isinstance(item, str):
+                buf += item.encode("utf-8")
+            else:
+                buf += orjson.dumps(
+                    item, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY
+                )
+            buf += b"\n"
+        return bytes(buf)
+
+
 @dataclass
 class ElasticRetrieverConfig(EditableRetrieverConfig):
     """Configuration class for ElasticRetriever.
@@ -31,6 +75,16 @@ class ElasticRetrieverConfig(EditableRetrieverConfig):
     :type retry_times: int
     :param retry_delay: Delay time for retry. Default: 0.5.
     :type retry_delay: float
+    :param ingest_workers: Number of threads used for bulk ingestion. Default: 4.
+    :type ingest_workers: int
+    :param msearch_chunk: Maximum number of queries sent in one msearch request.
+        Larger batches are split and issued concurrently. Default: 32.
+    :type msearch_chunk: int
+    :param request_timeout: Timeout for each request in seconds. Default: 30.0.
+    :type request_timeout: float
+    :param connections_per_node: Size of the HTTP connection pool per node.
+        Default: 16.
+    :type connections_per_node: int
     """
 
     host: str = "http://localhost:9200"
@@ -40,11 +94,20 @@ class ElasticRetrieverConfig(EditableRetrieverConfig):
     verbose: bool = False
     retry_times: int = 3
     retry_delay: float = 0.5
+    ingest_workers: int = 4
+    msearch_chunk: int = 32
+    request_timeout: float = 30.0
+    connections_per_node: int = 16
 
 
 @RETRIEVERS("elastic", config_class=ElasticRetrieverConfig)
 class ElasticRetriever(EditableRetriever):
     name = "ElasticSearch"
+    # maps the search method to the Elasticsearch query clause
+    QUERY_TYPES = {
+        "full_text": "multi_match",
+        "lucene": "query_string",
+    }
 
     def __init__(self, cfg: ElasticRetrieverConfig) -> None:
         super().__init__(cfg)
@@ -56,6 +119,8 @@ class ElasticRetriever(EditableRetriever):
         self.retry_times = cfg.retry_times
         self.retry_delay = cfg.retry_delay
         self.custom_properties = cfg.custom_properties
+        self.ingest_workers = cfg.ingest_workers
+        self.msearch_chunk = cfg.msearch_chunk
 
         # prepare client
         self.client = Elasticsearch(
@@ -63,6 +128,16 @@ class ElasticRetriever(EditableRetriever):
             api_key=self.api_key,
             max_retries=cfg.retry_times,
             retry_on_timeout=True,
+            # gzip the request/response bodies; decompression is far cheaper
+            # than moving uncompressed JSON for large top_k * batch responses
+            http_compress=True,
+            serializer=_OrjsonSerializer(),
+            serializers={"application/x-ndjson": _OrjsonNdjsonSerializer()},
+            request_timeout=cfg.request_timeout,
+            # the pool must be large enough for the concurrent msearch
+            # chunks and bulk ingest workers to reuse keep-alive connections
+            # instead of re-establishing TCP+TLS
+            connections_per_node=cfg.connections_per_node,
         )
 
         # set logger
@@ -79,9 +154,11 @@ class ElasticRetriever(EditableRetriever):
     @TIME_METER("elastic_search", "add_passages")
     def add_passages(self, passages: Iterable[Context]):
         def generate_actions():
-            index_exists = self.client.indices.exists(index=self.index_name)
-            actions = []
-            for n, passage in enumerate(passages):
+            # hoist the instance attributes; they are invariant across the
+            # loop and the lookups add up over million-passage corpora
+            index_name = self.index_name
+            index_exists = self.client.indices.exists(index=index_name)
+            for passage in passages:
                 # build index if not exists
                 if not index_exists:
                     if self.custom_properties is None:
@@ -98,41 +175,42 @@ class ElasticRetriever(EditableRetriever):
                         },
                     }
                     self.client.indices.create(
-                        index=self.index_name,
+                        index=index_name,
                         body=index_body,
                     )
                     index_exists = True
 
                 # prepare action
-                action = {
-                    "index": {
-                        "_index": self.index_name,
+                # let the server auto-generate the id when the passage does
+                # not carry one, which is cheaper than computing ids client-side
+                if passage.context_id is None:
+                    yield {"_index": index_name, "_source": passage.data}
+                else:
+                    yield {
+                        "_index": index_name,
                         "_id": passage.context_id,
+                        "_source": passage.data,
                     }
-                }
-                actions.append(action)
-                actions.append(passage.data)
-                if len(actions) == self.batch_size * 2:
-                    yield actions
-                    actions = []
-            if actions:
-                yield actions
             return
 
         p_logger = SimpleProgressLogger(logger, interval=self.log_interval)
-        for actions in generate_actions():
-            r = self.client.bulk(
-                operations=actions,
-                index=self.index_name,
-            )
-            if r.body["errors"]:
-                err_passage_ids = [
-                    item["index"]["_id"]
-                    for item in r.body["items"]
-                    if item["index"]["status"] != 201
-                ]
-                raise RuntimeError(f"Failed to index passages: {err_passage_ids}")
-            p_logger.update(len(actions) // 2, "Indexing")
+        err_passage_ids = []
+        for ok, result in parallel_bulk(
+            client=self.client,
+            actions=generate_actions(),
+            chunk_size=self.batch_size,
+            thread_count=self.ingest_workers,
+            raise_on_error=False,
+        ):
+            if not ok:
+                err_passage_ids.append(result["index"]["_id"])
+            p_logger.update(1, "Indexing")
+        if err_passage_ids:
+            raise RuntimeError(f"Failed to index passages: {err_passage_ids}")
+        # refresh once after the whole ingest so the new passages are
+        # immediately searchable; refreshing per request would force a
+        # Lucene segment flush for every batch
+        self.client.indices.refresh(index=self.index_name)
         logger.info(f"Finished adding passages.")
         return
 
@@ -144,32 +222,49 @@ class ElasticRetriever(EditableRetriever):
         **search_kwargs,
     ) -> list[list[RetrievedContext]]:
         # check search method
-        match search_method:
-            case "full_text":
-                query_type = "multi_match"
-            case "lucene":
-                query_type = "query_string"
-            case _:
-                raise ValueError(f"Invalid search method: {search_method}")
+        query_type = self.QUERY_TYPES.get(search_method)
+        if query_type is None:
+            raise ValueError(f"Invalid search method: {search_method}")
 
         # prepare search body
-        body = []
-        for q in query:
-            body.append({"index": self.index_name})
-            body.append(
-                {
-                    "query": {
-                        query_type: {
-                            "query": q,
-                            "fields": self.fields,
-                        },
+        # hoist the loop invariants: `fields` issues a get_mapping request,
+        # and the header dict can be shared as msearch copies it server-side
+        fields = self.fields
+        top_k = search_kwargs.pop("top_k", self.top_k)
+        header = {"index": self.index_name}
+        body = list(
+            itertools.chain.from_iterable(
+                (
+                    header,
+                    {
+                        "query": {query_type: {"query": q, "fields": fields}},
+                        "size": top_k,
                     },
-                    "size": search_kwargs.pop("top_k", self.top_k),
-                }
+                )
+                for q in query
             )
+        )
 
         # search and post-process
-        responses = self.client.msearch(body=body, **search_kwargs)["responses"]
+        # msearch is network-bound, so large batches are split into chunks
+        # that are issued concurrently to hide the server-side tail latency
+        chunk_size = self.msearch_chunk * 2
+        if len(body) > chunk_size:
+            chunks = [
+                body[i : i + chunk_size] for i in range(0, len(body), chunk_size)
+            ]
+            with ThreadPoolExecutor(max_workers=min(len(chunks), 8)) as pool:
+                futures = [
+                    pool.submit(self.client.msearch, body=c, **search_kwargs)
+                    for c in chunks
+                ]
+                responses = list(
+                    itertools.chain.from_iterable(
+                        f.result()["responses"] for f in futures
+                    )
+                )
+        else:
+            responses = self.client.msearch(body=body, **search_kwargs)["responses"]
         return self._form_results(query, responses)
 
     def clean(self) -> None:
@@ -192,32 +287,33 @@ class ElasticRetriever(EditableRetriever):
         results = []
         if responses is None:
             responses = [{"status": 500}] * len(query)
+        retriever = self.name
+        index_name = self.index_name
         for r, q in zip(responses, query):
             if r["status"] != 200:
                 results.append(
                     [
                         RetrievedContext(
-                            retriever=self.name,
+                            retriever=retriever,
                             query=q,
                             data={},
-                            source=self.index_name,
+                            source=index_name,
                             score=0.0,
                         )
                     ]
                 )
                 continue
-            r = r["hits"]["hits"]
             results.append(
                 [
                     RetrievedContext(
                         context_id=i["_id"],
-                        retriever=self.name,
+                        retriever=retriever,
                         query=q,
                         data=i["_source"],
                         source=i["_index"],
                         score=i["_score"],
                     )
-                    for i in r
+                    for i in r["hits"]["hits"]
                 ]
             )
         return results
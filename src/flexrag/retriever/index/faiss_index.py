@@ -17,7 +17,8 @@ class FaissIndexConfig(DenseIndexBaseConfig):
 
     :param index_type: The type of the index. Defaults to "auto".
         available choices are "FLAT", "IVF", "PQ", "IVFPQ", and "auto".
-        If set to "auto", the index will be set to "IVF{n_list},PQ{embedding_size//2}x4fs".
+        If set to "auto", the index will be set to
+        "OPQ{embedding_size//2}_{embedding_size},IVF{n_list}_HNSW32,PQ{embedding_size//2}x4fsr".
     :type index_type: str
     :param n_subquantizers: The number of subquantizers. Defaults to 8.
     :type n_subquantizers: int
@@ -39,6 +40,23 @@ class FaissIndexConfig(DenseIndexBaseConfig):
     :type polysemous_ht: int
     :param efSearch: The efSearch for HNSW. Defaults to 100.
     :type efSearch: int
+    :param num_threads: The number of OpenMP threads used by faiss.
+        Defaults to -1, which keeps the faiss default.
+    :type num_threads: int
+    :param flat_quant: The scalar quantization applied to the "FLAT" index.
+        Defaults to "fp32" (no quantization). "fp16" and "int8" keep the
+        brute-force search but halve / quarter the memory traffic.
+    :type flat_quant: str
+    :param mmap_threshold_gb: Load CPU indices larger than this size (in GB)
+        with a memory map instead of reading them into RAM. Defaults to 2.0.
+    :type mmap_threshold_gb: float
+    :param read_only: Open memory-mapped indices read-only, so that the
+        mapping can be shared across processes. Defaults to True.
+    :type read_only: bool
+    :param num_shards: Split a CPU index into this many threaded shards so
+        that embeddings are added in parallel. Defaults to 1 (no sharding).
+        Requires an IVF-style index; ignored when the index runs on GPU.
+    :type num_shards: int
     """
 
     index_type: Choices(["FLAT", "IVF", "PQ", "IVFPQ", "auto"]) = "auto"  # type: ignore
@@ -46,12 +64,17 @@ class FaissIndexConfig(DenseIndexBaseConfig):
     n_bits: int = 8
     n_list: int = 1000
     factory_str: Optional[str] = None
+    flat_quant: Choices(["fp32", "fp16", "int8"]) = "fp32"  # type: ignore
     # Inference Arguments
     n_probe: int = 32
     device_id: list[int] = field(default_factory=list)
     k_factor: int = 10
     polysemous_ht: int = 0
     efSearch: int = 100
+    num_threads: int = -1
+    mmap_threshold_gb: float = 2.0
+    read_only: bool = True
+    num_shards: int = 1
 
 
 @DENSE_INDEX("faiss", config_class=FaissIndexConfig)
@@ -75,6 +98,10 @@ class FaissIndex(DenseIndexBase):
                 "or `conda install -c pytorch -c nvidia faiss-gpu`"
             )
 
+        # set the omp threads once at construction
+        if cfg.num_threads > 0:
+            self.faiss.omp_set_num_threads(cfg.num_threads)
+
         # preapre inference args
         self.n_probe = cfg.n_probe
         self.device_id = (
@@ -88,9 +115,25 @@ class FaissIndex(DenseIndexBase):
         self.index_type = cfg.index_type
         self.distance_function = cfg.distance_function
         self.n_list = cfg.n_list
+        self.flat_quant = cfg.flat_quant
         self.n_subquantizers = cfg.n_subquantizers
         self.n_bits = cfg.n_bits
         self.factory_str = cfg.factory_str
+        self.mmap_threshold_gb = cfg.mmap_threshold_gb
+        self.read_only = cfg.read_only
+        self.num_shards = cfg.num_shards
+
+        # cache for the search-parameter objects, keyed by the search kwargs
+        self._params_cache: dict[tuple, object] = {}
+        # the parameters currently applied to the index via ParameterSpace
+        self._applied_params: Optional[tuple] = None
+        # cached results of the is_trained / is_flat index walks
+        self._is_trained_cache: Optional[bool] = None
+        self._is_flat_cache: Optional[bool] = None
+        # keeps the GPU-cloned refine components alive (see _refine_to_gpu)
+        self._gpu_refine_refs: Optional[tuple] = None
+        # keeps the CPU shard sub-indexes alive (see _shard_index)
+        self._shard_refs: Optional[list] = None
 
         # load the index if exists
         self.index = None
@@ -139,7 +182,15 @@ class FaissIndex(DenseIndexBase):
 
         if index_type == "auto":
             n_list = 2 ** int(np.log2(np.sqrt(embedding_length)))
-            factory_str = f"IVF{n_list},PQ{embedding_size//2}x4fs"
+            if embedding_size % 4 == 0:
+                # OPQ rotation + HNSW coarse quantizer + refined fast-scan PQ
+                factory_str = (
+                    f"OPQ{embedding_size//2}_{embedding_size},"
+                    f"IVF{n_list}_HNSW32,"
+                    f"PQ{embedding_size//2}x4fsr"
+                )
+            else:
+                factory_str = f"IVF{n_list},PQ{embedding_size//2}x4fs"
             logger.info(f"Auto set index to {factory_str}")
             logger.info(
                 f"We recommend to set n_probe to {n_list//8} for better inference performance"
@@ -156,7 +207,21 @@ class FaissIndex(DenseIndexBase):
             # prepare optimized index
             match index_type:
                 case "FLAT":
-                    index = basic_index
+                    match self.flat_quant:
+                        case "fp16":
+                            index = self.faiss.IndexScalarQuantizer(
+                                embedding_size,
+                                self.faiss.ScalarQuantizer.QT_fp16,
+                                basic_metric,
+                            )
+                        case "int8":
+                            index = self.faiss.IndexScalarQuantizer(
+                                embedding_size,
+                                self.faiss.ScalarQuantizer.QT_8bit,
+                                basic_metric,
+                            )
+                        case _:
+                            index = basic_index
                 case "IVF":
                     index = self.faiss.IndexIVFFlat(
                         basic_index,
@@ -193,22 +258,67 @@ class FaissIndex(DenseIndexBase):
         if (self.index_train_num >= embeddings.shape[0]) or (
             self.index_train_num == -1
         ):
-            if embeddings.dtype != np.float32:
-                embeddings = embeddings.astype("float32")
-            self.index.train(embeddings)
+            train_embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
         else:
-            selected_indices = np.random.choice(
-                embeddings.shape[0],
-                self.index_train_num,
-                replace=False,
+            n_total = embeddings.shape[0]
+            rng = np.random.default_rng()
+            if self.index_train_num < n_total // 16:
+                # Floyd's sampling algorithm: O(k) memory, while
+                # choice(replace=False) builds an O(N) permutation buffer
+                selected = set()
+                for j in range(n_total - self.index_train_num, n_total):
+                    t = int(rng.integers(0, j + 1))
+                    selected.add(t if t not in selected else j)
+                selected_indices = np.fromiter(
+                    selected, dtype=np.int64, count=self.index_train_num
+                )
+            else:
+                selected_indices = rng.choice(
+                    n_total, self.index_train_num, replace=False
+                )
+            selected_indices.sort()
+            train_embeddings = np.ascontiguousarray(
+                np.take(embeddings, selected_indices, axis=0), dtype=np.float32
             )
-            selected_indices = np.sort(selected_indices)
-            selected_embeddings = embeddings[selected_indices].astype("float32")
-            self.index.train(selected_embeddings)
+        self._train_coarse_quantizer_on_gpu(train_embeddings)
+        if isinstance(self.index, self.faiss.IndexShards):
+            # train one shard and clone the trained state into the others
+            # instead of repeating k-means once per shard
+            proto = self.faiss.downcast_index(self.index.at(0))
+            proto.train(train_embeddings)
+            self.index = self._shard_index(proto)
+        else:
+            self.index.train(train_embeddings)
+        return
+
+    def _train_coarse_quantizer_on_gpu(self, embeddings: np.ndarray) -> None:
+        """Train the IVF coarse quantizer with GPU k-means before the main
+        train call. faiss accepts a pre-filled quantizer as trained, so the
+        subsequent ``index.train`` only fits the fine quantizers. Falls back
+        silently when no GPU is requested or the index has no CPU-resident
+        untrained IVF component."""
+        if len(self.device_id) == 0:
+            return
+        if not hasattr(self.faiss, "Kmeans"):
+            return
+        try:
+            ivf_index = self.faiss.extract_index_ivf(self.index)
+        except RuntimeError:
+            return
+        if ivf_index.is_trained:
+            return
+        quantizer = getattr(ivf_index, "quantizer", None)
+        if quantizer is None or quantizer.ntotal > 0:
+            return
+        logger.info("Training the coarse quantizer with GPU k-means")
+        kmeans = self.faiss.Kmeans(ivf_index.d, ivf_index.nlist, niter=25, gpu=True)
+        kmeans.train(embeddings)
+        quantizer.add(kmeans.centroids)
         return
 
     def add_embeddings_batch(self, embeddings: np.ndarray) -> None:
-        embeddings = embeddings.astype("float32")
+        # no-op when the embeddings are already contiguous float32
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
         assert self.is_trained, "Index should be trained first"
         self.index.add(embeddings)  # debug
         return
@@ -220,6 +330,12 @@ class FaissIndex(DenseIndexBase):
         polysemous_ht = kwargs.get("polysemous_ht", self.polysemous_ht)
         efSearch = kwargs.get("efSearch", self.efSearch)
 
+        # rebuilding the parameter objects walks the index tree on every
+        # search, so reuse them as long as the index and kwargs are unchanged
+        cache_key = (id(self.index), k_factor, n_probe, polysemous_ht, efSearch)
+        if cache_key in self._params_cache:
+            return self._params_cache[cache_key]
+
         def get_search_params(index):
             if isinstance(index, self.faiss.IndexRefine):
                 params = self.faiss.IndexRefineSearchParameters(
@@ -265,7 +381,38 @@ class FaissIndex(DenseIndexBase):
                 params = None
             return params
 
-        return get_search_params(self.index)
+        params = get_search_params(self.index)
+        self._params_cache[cache_key] = params
+        return params
+
+    def _apply_search_params(self, **kwargs) -> bool:
+        """Set the search parameters directly on the index through
+        ``faiss.ParameterSpace``. The values stick to the index, so the
+        steady-state search path can pass ``params=None`` without building
+        any parameter objects. Returns False when the index does not support
+        this API (e.g. GPU-resident indices), in which case the caller
+        should fall back to the ``SearchParameters`` tree."""
+        params = (
+            ("k_factor", kwargs.get("k_factor", self.k_factor)),
+            ("nprobe", kwargs.get("n_probe", self.n_probe)),
+            ("ht", kwargs.get("polysemous_ht", self.polysemous_ht)),
+            ("efSearch", kwargs.get("efSearch", self.efSearch)),
+            ("quantizer_efSearch", kwargs.get("efSearch", self.efSearch)),
+        )
+        if params == self._applied_params:
+            return True
+        if self.support_gpu:
+            return False
+        ps = self.faiss.ParameterSpace()
+        for name, value in params:
+            try:
+                ps.set_index_parameter(self.index, name, value)
+            except RuntimeError:
+                # the index exposes no such parameter; the explicit
+                # SearchParameters tree would not carry it either
+                pass
+        self._applied_params = params
+        return True
 
     def _search_batch(
         self,
@@ -273,8 +420,11 @@ class FaissIndex(DenseIndexBase):
         top_docs: int,
         **search_kwargs,
     ) -> tuple[np.ndarray, np.ndarray]:
-        query_vectors = query_vectors.astype("float32")
-        search_params = self.prepare_search_params(**search_kwargs)
+        query_vectors = np.ascontiguousarray(query_vectors, dtype=np.float32)
+        if self._apply_search_params(**search_kwargs):
+            search_params = None
+        else:
+            search_params = self.prepare_search_params(**search_kwargs)
         scores, indices = self.index.search(
             query_vectors, top_docs, params=search_params
         )
@@ -288,25 +438,45 @@ class FaissIndex(DenseIndexBase):
         logger.info(f"Serializing index to {self.index_path}")
         if self.support_gpu:
             cpu_index = self.faiss.index_gpu_to_cpu(self.index)
+        elif isinstance(self.index, self.faiss.IndexShards):
+            cpu_index = self._merge_shards()
         else:
             cpu_index = self.index
         self.faiss.write_index(cpu_index, self.index_path)
         return
 
+    def _merge_shards(self):
+        """Drain all shards into the first one so that the index can be
+        written with ``write_index``. The stored ids are preserved and the
+        merged shard keeps serving searches afterwards."""
+        merged = self.faiss.downcast_index(self.index.at(0))
+        for i in range(1, self.index.count()):
+            self.faiss.merge_into(
+                merged, self.faiss.downcast_index(self.index.at(i)), False
+            )
+        return merged
+
     def deserialize(self):
         assert self.index_path is not None, "Index path is not set."
         logger.info(f"Loading index from {self.index_path}.")
-        if (os.path.getsize(self.index_path) / (1024**3) > 10) and (
-            not self.support_gpu
-        ):
+        size_gb = os.path.getsize(self.index_path) / (1024**3)
+        if (size_gb > self.mmap_threshold_gb) and (not self.support_gpu):
             logger.info("Index file is too large. Loading on CPU with memory map.")
-            cpu_index = self.faiss.read_index(self.index_path, self.faiss.IO_FLAG_MMAP)
+            flags = self.faiss.IO_FLAG_MMAP
+            if self.read_only:
+                # a read-only mapping can be shared across processes
+                flags |= self.faiss.IO_FLAG_READ_ONLY
+            cpu_index = self.faiss.read_index(self.index_path, flags)
         else:
             cpu_index = self.faiss.read_index(self.index_path)
         self.index = self._set_index(cpu_index)
         return self.index
 
     def clean(self):
+        self._params_cache.clear()
+        self._applied_params = None
+        self._is_trained_cache = None
+        self._is_flat_cache = None
         if self.index is None:
             return
         if self.index_path is not None:
@@ -323,6 +493,9 @@ class FaissIndex(DenseIndexBase):
 
     @property
     def is_trained(self) -> bool:
+        # trained is monotonic, so only the positive result is cached
+        if self._is_trained_cache:
+            return True
         if self.index is None:
             return False
         if isinstance(self.index, self.faiss.IndexReplicas):
@@ -331,8 +504,10 @@ class FaissIndex(DenseIndexBase):
                 sub_index = self.faiss.downcast_index(self.index.at(i))
                 if not sub_index.is_trained:
                     trained = False
-            return trained
-        return self.index.is_trained
+        else:
+            trained = self.index.is_trained
+        self._is_trained_cache = trained
+        return trained
 
     @property
     def is_addable(self) -> bool:
@@ -349,18 +524,21 @@ class FaissIndex(DenseIndexBase):
             return False
 
         if self.index is None:
-            return self.index_type == "FLAT"
-        if _is_flat(self.index):
-            return True
-        if isinstance(self.index, self.faiss.IndexReplicas):
+            # the scalar-quantized "FLAT" variants still require training
+            return (self.index_type == "FLAT") and (self.flat_quant == "fp32")
+        # the index composition only changes through _set_index / clean
+        if self._is_flat_cache is not None:
+            return self._is_flat_cache
+        flat = _is_flat(self.index)
+        if (not flat) and isinstance(self.index, self.faiss.IndexReplicas):
             all_flat = True
             for i in range(self.index.count()):
                 sub_index = self.faiss.downcast_index(self.index.at(i))
                 if not _is_flat(sub_index):
                     all_flat = False
-            if all_flat:
-                return True
-        return False
+            flat = all_flat
+        self._is_flat_cache = flat
+        return flat
 
     @property
     def support_gpu(self) -> bool:
@@ -374,6 +552,10 @@ class FaissIndex(DenseIndexBase):
         return self.index.ntotal
 
     def _set_index(self, index):
+        self._params_cache.clear()
+        self._applied_params = None
+        self._is_trained_cache = None
+        self._is_flat_cache = None
         if self.support_gpu:
             logger.info("Accelerating index with GPU.")
             option = self.faiss.GpuMultipleClonerOptions()
@@ -381,15 +563,70 @@ class FaissIndex(DenseIndexBase):
             option.shard = True
             if isinstance(index, self.faiss.IndexIVFFlat):
                 option.common_ivf_quantizer = True
-            index = self.faiss.index_cpu_to_gpus_list(
-                index,
-                co=option,
-                gpus=self.device_id,
-                ngpu=len(self.device_id),
-            )
+            if isinstance(index, self.faiss.IndexRefine):
+                index = self._refine_to_gpu(index, option)
+            else:
+                index = self.faiss.index_cpu_to_gpus_list(
+                    index,
+                    co=option,
+                    gpus=self.device_id,
+                    ngpu=len(self.device_id),
+                )
         elif len(self.device_id) > 0:
             logger.warning(
                 "The installed faiss does not support GPU acceleration. "
                 "Please install faiss-gpu."
             )
+        elif (self.num_shards > 1) and (index.ntotal == 0):
+            index = self._shard_index(index)
         return index
+
+    def _shard_index(self, index):
+        """Wrap an empty CPU index into a threaded ``IndexShards`` so that
+        added embeddings are split across the shards and inserted in
+        parallel."""
+        logger.info(f"Sharding the index into {self.num_shards} threaded shards.")
+        sub_indexes = [index] + [
+            self.faiss.clone_index(index) for _ in range(1, self.num_shards)
+        ]
+        shards = self.faiss.IndexShards(index.d, True, True)
+        for sub_index in sub_indexes:
+            shards.add_shard(sub_index)
+        sync = getattr(shards, "syncWithSubIndexes", None) or getattr(
+            shards, "sync_with_shard_indexes", None
+        )
+        if sync is not None:
+            sync()
+        # IndexShards does not own its shards; keep them alive here
+        self._shard_refs = sub_indexes
+        return shards
+
+    def _refine_to_gpu(self, index, option):
+        """Move an ``IndexRefine`` to GPU. The faiss cloner does not handle
+        ``IndexRefine`` directly, so the base index and the exact-distance
+        refinement store are cloned separately and reassembled. Falls back
+        to the CPU index when either clone is unsupported."""
+        try:
+            gpu_base = self.faiss.index_cpu_to_gpus_list(
+                self.faiss.downcast_index(index.base_index),
+                co=option,
+                gpus=self.device_id,
+                ngpu=len(self.device_id),
+            )
+            gpu_refine = self.faiss.index_cpu_to_gpus_list(
+                self.faiss.downcast_index(index.refine_index),
+                co=option,
+                gpus=self.device_id,
+                ngpu=len(self.device_id),
+            )
+        except RuntimeError:
+            logger.warning(
+                "Failed to move the refine index to GPU. "
+                "Keeping the refinement on CPU."
+            )
+            return index
+        gpu_index = self.faiss.IndexRefine(gpu_base, gpu_refine)
+        gpu_index.k_factor = index.k_factor
+        # the new IndexRefine does not own the clones; keep them alive here
+        self._gpu_refine_refs = (gpu_base, gpu_refine)
+        return gpu_index
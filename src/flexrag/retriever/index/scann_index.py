@@ -83,8 +83,8 @@ class ScaNNIndex(DenseIndexBase):
             .reorder(200)
         )
         builder.set_n_training_threads(self.cfg.threads)
-        ids = list(np.arange(len(embeddings)))
-        ids = [str(i) for i in ids]
+        # materialize the string docids in one vectorized pass
+        ids = np.arange(len(embeddings)).astype(np.str_).tolist()
 
         # build the index
         self.index = builder.build(docids=ids)
@@ -96,10 +96,10 @@ class ScaNNIndex(DenseIndexBase):
         return
 
     def add_embeddings_batch(self, embeddings: np.ndarray) -> None:
-        embeddings = embeddings.astype("float32")
+        # no-op when the embeddings are already contiguous float32
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
         assert self.is_trained, "Index should be trained first"
-        ids = list(range(len(self), len(self) + len(embeddings)))
-        ids = [str(i) for i in ids]
+        ids = np.arange(len(self), len(self) + len(embeddings)).astype(np.str_).tolist()
         self.index.upsert(docids=ids, database=embeddings, batch_size=self.batch_size)
         return
 
@@ -109,10 +109,13 @@ class ScaNNIndex(DenseIndexBase):
         top_k: int,
         **search_kwargs,
     ) -> tuple[np.ndarray, np.ndarray]:
-        query = query.astype("float32")
+        query = np.ascontiguousarray(query, dtype=np.float32)
         indices, scores = self.index.search_batched(query, top_k, **search_kwargs)
-        indices = np.array([[int(i) for i in idx] for idx in indices])
-        return indices, scores
+        # convert the string docids back to integers in one vectorized cast
+        indices = np.asarray(indices)
+        if indices.dtype.kind in ("U", "S", "O"):
+            indices = indices.astype(np.int64)
+        return indices, np.asarray(scores)
 
     def serialize(self, index_path: str = None) -> None:
         if index_path is not None:
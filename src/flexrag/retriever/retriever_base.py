@@ -1,8 +1,12 @@
 import asyncio
+import importlib
 import os
+import pickle
 import tempfile
 import time
+from hashlib import blake2b
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Iterable, Optional
 
@@ -95,26 +99,36 @@ def batched_cache(func):
             return func(self, query, **search_kwargs)
 
         # search from cache
+        # digest the configuration once so that the per-query cache keys stay
+        # small and the full config is not serialized for every query
         cfg = dataclass_to_dict(self.cfg)
+        cfg_digest = blake2b(
+            pickle.dumps((cfg, search_kwargs), protocol=pickle.HIGHEST_PROTOCOL),
+            digest_size=16,
+        ).hexdigest()
         keys = [
             {
-                "retriever_config": cfg,
+                "retriever_digest": cfg_digest,
                 "query": q,
-                "search_kwargs": search_kwargs,
             }
             for q in query
         ]
-        results = [dict_to_retrieved(RETRIEVAL_CACHE.get(k, None)) for k in keys]
+        results = [dict_to_retrieved(r) for r in RETRIEVAL_CACHE.get_many(keys)]
 
         # search from database
         new_query = [q for q, r in zip(query, results) if r is None]
         new_indices = [n for n, r in enumerate(results) if r is None]
         if new_query:
             new_results = func(self, new_query, **search_kwargs)
-            # update cache
+            # update cache, writing all new entries in one roundtrip
             for n, r in zip(new_indices, new_results):
                 results[n] = r
-                RETRIEVAL_CACHE[keys[n]] = retrieved_to_dict(r)
+            RETRIEVAL_CACHE.put_many(
+                [
+                    (keys[n], retrieved_to_dict(r))
+                    for n, r in zip(new_indices, new_results)
+                ]
+            )
         # check results
         check(results)
         return results
@@ -246,6 +260,10 @@ class EditableRetriever(RetrieverBase):
         self.query_preprocess_pipeline = TextProcessPipeline(
             cfg.query_preprocess_pipeline
         )
+        self._preproc_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+        # a single worker keeps the batched searches serialized while
+        # letting one batch stay in flight (see `search`)
+        self._search_pool = ThreadPoolExecutor(max_workers=1)
         return
 
     @abstractmethod
@@ -284,14 +302,35 @@ class EditableRetriever(RetrieverBase):
         # search for documents
         query = [query] if isinstance(query, str) else query
         if not no_preprocess:
-            query = [self.query_preprocess_pipeline(q) for q in query]
+            # run the pipeline in the pool so that preprocessing the later
+            # batches overlaps with searching the earlier ones
+            futures = [
+                self._preproc_pool.submit(self.query_preprocess_pipeline, q)
+                for q in query
+            ]
+        else:
+            futures = None
         final_results = []
         p_logger = SimpleProgressLogger(logger, len(query), self.log_interval)
+
+        # double-buffering: keep one search_batch in flight on the worker
+        # while this thread gathers the previous results and the next batch
+        pending = None
         for idx in range(0, len(query), self.batch_size):
+            if futures is None:
+                batch = query[idx : idx + self.batch_size]
+            else:
+                batch = [f.result() for f in futures[idx : idx + self.batch_size]]
+            next_pending = self._search_pool.submit(
+                self.search_batch, batch, **search_kwargs
+            )
+            if pending is not None:
+                p_logger.update(1, "Retrieving")
+                final_results.extend(pending.result())
+            pending = next_pending
+        if pending is not None:
             p_logger.update(1, "Retrieving")
-            batch = query[idx : idx + self.batch_size]
-            results_ = self.search_batch(batch, **search_kwargs)
-            final_results.extend(results_)
+            final_results.extend(pending.result())
         return final_results
 
     @abstractmethod
@@ -496,6 +535,10 @@ class LocalRetriever(EditableRetriever):
     def load_from_local(
         repo_path: str = None, retriever_config: LocalRetrieverConfig = None
     ) -> "LocalRetriever":
+        # make sure every retriever class is registered before the lookup,
+        # as the package imports the retriever modules lazily
+        importlib.import_module("flexrag.retriever")._import_all()
+
         # prepare the cls
         id_path = os.path.join(repo_path, "cls.id")
         with open(id_path, "r", encoding="utf-8") as f:
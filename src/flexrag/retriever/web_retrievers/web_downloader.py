@@ -1,12 +1,13 @@
 import asyncio
 import io
+import os
 from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import partial
 from typing import Any, Optional
 
-from httpx import Client
+from httpx import Client, Limits
 from PIL import Image
 from PIL.ImageFile import ImageFile
 from tenacity import retry, stop_after_attempt, wait_fixed
@@ -20,9 +21,14 @@ class WebDownloaderBaseConfig:
 
     :param allow_parallel: Whether to allow parallel downloading. Default is True.
     :type allow_parallel: bool
+    :param max_workers: The number of download threads. Default is None.
+        If None, min(64, cpu_count * 4) threads are used, as downloading is
+        latency-bound rather than CPU-bound.
+    :type max_workers: Optional[int]
     """
 
     allow_parallel: bool = True
+    max_workers: Optional[int] = None
 
 
 class WebDownloaderBase(ABC):
@@ -30,6 +36,12 @@ class WebDownloaderBase(ABC):
 
     def __init__(self, cfg: WebDownloaderBaseConfig) -> None:
         self.allow_parallel = cfg.allow_parallel
+        # reuse one pool across download calls to amortize thread startup
+        if self.allow_parallel:
+            max_workers = cfg.max_workers or min(64, (os.cpu_count() or 4) * 4)
+            self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            self._pool = None
         return
 
     def download(self, urls: str | list[str]) -> list[Any]:
@@ -42,13 +54,19 @@ class WebDownloaderBase(ABC):
         """
         if isinstance(urls, str):
             urls = [urls]
-        if self.allow_parallel:
-            with ThreadPoolExecutor() as executor:
-                results = list(executor.map(self.download_page, urls))
+        if self._pool is not None:
+            results = list(self._pool.map(self.download_page, urls))
         else:
             results = [self.download_page(url) for url in urls]
         return results
 
+    def close(self) -> None:
+        """Shutdown the download threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        return
+
     async def async_download(self, urls: str | list[str]) -> Any:
         """Download the web pages asynchronously."""
         if isinstance(urls, str):
@@ -106,30 +124,43 @@ class SimpleWebDownloader(WebDownloaderBase):
     def __init__(self, cfg: SimpleWebDownloaderConfig) -> None:
         super().__init__(cfg)
         # setting httpx client
+        # HTTP/2 lets parallel requests to the same host share one connection,
+        # but requires the optional `h2` package (`pip install httpx[http2]`)
+        try:
+            import h2  # noqa: F401
+
+            http2 = True
+        except ImportError:
+            http2 = False
         self.client = Client(
             headers=cfg.headers,
-            proxies=cfg.proxy,
+            proxy=cfg.proxy,
             timeout=cfg.timeout,
+            http2=http2,
+            limits=Limits(
+                max_connections=200,
+                max_keepalive_connections=100,
+                keepalive_expiry=30.0,
+            ),
         )
 
-        # setting retry parameters
-        self.skip_bad_response = cfg.skip_bad_response
-        self.max_retries = cfg.max_retries
-        self.retry_delay = cfg.retry_delay
+        # build the retry wrapper once instead of on every download_page call
+        retry_kwargs = {
+            "stop": stop_after_attempt(cfg.max_retries),
+            "wait": wait_fixed(cfg.retry_delay),
+        }
+        if cfg.skip_bad_response:
+            retry_kwargs["retry_error_callback"] = lambda _: None
+        self._download_page = retry(**retry_kwargs)(self._fetch_page)
         return
 
-    def download_page(self, url: str) -> str:
-        @retry(
-            stop=stop_after_attempt(self.max_retries),
-            wait=wait_fixed(self.retry_delay),
-            retry_error_callback=lambda _: None if self.skip_bad_response else None,
-        )
-        def download_page(url):
-            response = self.client.get(url)
-            response.raise_for_status()
-            return response.text
+    def _fetch_page(self, url: str) -> str:
+        response = self.client.get(url)
+        response.raise_for_status()
+        return response.text
 
-        return download_page(url)
+    def download_page(self, url: str) -> str:
+        return self._download_page(url)
 
 
 @dataclass
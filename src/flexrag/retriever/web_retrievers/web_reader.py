@@ -98,13 +98,27 @@ class JinaReaderLM(WebReaderBase):
     """The JinaReaderLM reads the web pages using the Jina ReaderLM model."""
 
     # Patterns
-    SCRIPT_PATTERN = r"<[ ]*script.*?\/[ ]*script[ ]*>"
-    STYLE_PATTERN = r"<[ ]*style.*?\/[ ]*style[ ]*>"
-    META_PATTERN = r"<[ ]*meta.*?>"
-    COMMENT_PATTERN = r"<[ ]*!--.*?--[ ]*>"
-    LINK_PATTERN = r"<[ ]*link.*?>"
-    BASE64_IMG_PATTERN = r'<img[^>]+src="data:image/[^;]+;base64,[^"]+"[^>]*>'
-    SVG_PATTERN = r"(<svg[^>]*>)(.*?)(<\/svg>)"
+    # the patterns are compiled once (with their flags) as they are applied
+    # to every downloaded page
+    SCRIPT_PATTERN = re.compile(
+        r"<[ ]*script.*?\/[ ]*script[ ]*>", re.IGNORECASE | re.MULTILINE | re.DOTALL
+    )
+    STYLE_PATTERN = re.compile(
+        r"<[ ]*style.*?\/[ ]*style[ ]*>", re.IGNORECASE | re.MULTILINE | re.DOTALL
+    )
+    META_PATTERN = re.compile(
+        r"<[ ]*meta.*?>", re.IGNORECASE | re.MULTILINE | re.DOTALL
+    )
+    COMMENT_PATTERN = re.compile(
+        r"<[ ]*!--.*?--[ ]*>", re.IGNORECASE | re.MULTILINE | re.DOTALL
+    )
+    LINK_PATTERN = re.compile(
+        r"<[ ]*link.*?>", re.IGNORECASE | re.MULTILINE | re.DOTALL
+    )
+    BASE64_IMG_PATTERN = re.compile(
+        r'<img[^>]+src="data:image/[^;]+;base64,[^"]+"[^>]*>'
+    )
+    SVG_PATTERN = re.compile(r"(<svg[^>]*>)(.*?)(<\/svg>)", re.DOTALL)
 
     def __init__(self, cfg: JinaReaderLMConfig):
         self.reader = GENERATORS.load(cfg)
@@ -157,6 +171,9 @@ class JinaReaderLM(WebReaderBase):
         texts = self.reader.chat(prompts, generation_config=self.cfg)
         texts = [t[0] for t in texts]
         contexts = []
+        # consume the generated texts through an iterator;
+        # list.pop(0) shifts the remaining items on every call
+        texts_iter = iter(texts)
         for p, ctx in zip(web_pages, retrieved_contexts):
             if p is None:
                 continue
@@ -164,7 +181,7 @@ class JinaReaderLM(WebReaderBase):
                 RetrievedContext(
                     retriever=ctx.engine,
                     query=ctx.query,
-                    data={"raw_content": p, "processed_content": texts.pop(0)},
+                    data={"raw_content": p, "processed_content": next(texts_iter)},
                     source=ctx.url,
                 )
             )
@@ -176,53 +193,25 @@ class JinaReaderLM(WebReaderBase):
 
     @staticmethod
     def replace_svg(html: str, new_content: str = "this is a placeholder") -> str:
-        return re.sub(
-            JinaReaderLM.SVG_PATTERN,
+        return JinaReaderLM.SVG_PATTERN.sub(
             lambda match: f"{match.group(1)}{new_content}{match.group(3)}",
             html,
-            flags=re.DOTALL,
         )
 
     @staticmethod
     def replace_base64_images(html: str, new_image_src: str = "#") -> str:
-        return re.sub(
-            JinaReaderLM.BASE64_IMG_PATTERN,
+        return JinaReaderLM.BASE64_IMG_PATTERN.sub(
             f'<img src="{new_image_src}"/>',
             html,
         )
 
     @staticmethod
     def clean_html(html: str, clean_svg: bool = False, clean_base64: bool = False):
-        html = re.sub(
-            JinaReaderLM.SCRIPT_PATTERN,
-            "",
-            html,
-            flags=re.IGNORECASE | re.MULTILINE | re.DOTALL,
-        )
-        html = re.sub(
-            JinaReaderLM.STYLE_PATTERN,
-            "",
-            html,
-            flags=re.IGNORECASE | re.MULTILINE | re.DOTALL,
-        )
-        html = re.sub(
-            JinaReaderLM.META_PATTERN,
-            "",
-            html,
-            flags=re.IGNORECASE | re.MULTILINE | re.DOTALL,
-        )
-        html = re.sub(
-            JinaReaderLM.COMMENT_PATTERN,
-            "",
-            html,
-            flags=re.IGNORECASE | re.MULTILINE | re.DOTALL,
-        )
-        html = re.sub(
-            JinaReaderLM.LINK_PATTERN,
-            "",
-            html,
-            flags=re.IGNORECASE | re.MULTILINE | re.DOTALL,
-        )
+        html = JinaReaderLM.SCRIPT_PATTERN.sub("", html)
+        html = JinaReaderLM.STYLE_PATTERN.sub("", html)
+        html = JinaReaderLM.META_PATTERN.sub("", html)
+        html = JinaReaderLM.COMMENT_PATTERN.sub("", html)
+        html = JinaReaderLM.LINK_PATTERN.sub("", html)
 
         if clean_svg:
             html = JinaReaderLM.replace_svg(html)
@@ -1,4 +1,3 @@
-import json
 import os
 import time
 from abc import abstractmethod
@@ -10,7 +9,13 @@ from omegaconf import MISSING
 from tenacity import RetryCallState, retry, stop_after_attempt, wait_fixed
 
 from flexrag.common_dataclass import RetrievedContext
-from flexrag.utils import LOGGER_MANAGER, TIME_METER, Choices, SimpleProgressLogger
+from flexrag.utils import (
+    LOGGER_MANAGER,
+    TIME_METER,
+    Choices,
+    SimpleProgressLogger,
+    json_dump,
+)
 
 from ..retriever_base import (
     RETRIEVERS,
@@ -29,7 +34,7 @@ def _save_error_state(retry_state: RetryCallState) -> Exception:
         "kwargs": retry_state.kwargs,
     }
     with open("web_retriever_error_state.json", "w", encoding="utf-8") as f:
-        json.dump(args, f)
+        json_dump(args, f)
     raise retry_state.outcome.exception()
 
 
@@ -6,6 +6,9 @@ from typing import Optional
 from .processor import PROCESSORS, Processor, TextUnit
 from .utils import UnifiedTokenizer, UTokenizerConfig
 
+# compiled once as the processors run per passage
+_ARTICLE_PATTERN = re.compile(r"\b(a|an|the)\b")
+
 
 @dataclass
 class TokenNormalizerConfig:
@@ -125,7 +128,7 @@ class AnswerSimplifier(Processor):
         # lower case
         input_text.content = input_text.content.lower()
         # remove_articles
-        text = re.sub(r"\b(a|an|the)\b", " ", input_text.content)
+        text = _ARTICLE_PATTERN.sub(" ", input_text.content)
         # unify white space
         text = " ".join(text.split())
         # remove punctuation
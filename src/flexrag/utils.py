@@ -1,20 +1,19 @@
 import importlib
+import inspect
 import json
 import logging
 import os
 import sys
 import threading
+from collections import defaultdict
 from contextlib import contextmanager
 from dataclasses import field, make_dataclass
 from enum import Enum
-from functools import partial
-from multiprocessing import Manager
 from time import perf_counter
-from typing import Coroutine, Generic, Iterable, Optional, TypeVar
+from typing import Generic, Iterable, Optional, TypeVar
 
 import colorama
 import numpy as np
-from huggingface_hub import HfApi
 from omegaconf import MISSING, DictConfig, ListConfig, OmegaConf
 
 
@@ -31,22 +30,28 @@ class SimpleProgressLogger:
         self.interval = interval
         self.logger = logger
         self.current = 0
-        self.current_stage = 0
         self.desc = "Progress"
         self.start_time = perf_counter()
+        # hoisted out of the per-step path: the ratio becomes one multiply
+        # and the threshold check one subtraction
+        self._inv_total = 1.0 / total if total else None
+        self._last_logged = 0
         return
 
     def update(self, step: int = 1, desc: str = None) -> None:
         if desc is not None:
             self.desc = desc
         self.current += step
-        stage = self.current // self.interval
-        if stage > self.current_stage:
-            self.current_stage = stage
+        if self.current - self._last_logged >= self.interval:
+            self._last_logged = self.current
             self.log()
         return
 
     def log(self) -> None:
+        # skip the formatting work entirely when the record would be dropped
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         def fmt_time(time: float) -> str:
             if time < 60:
                 return f"{time:.2f}s"
@@ -60,7 +65,7 @@ class SimpleProgressLogger:
             time_left = time_spend * (self.total - self.current) / self.current
             speed = self.current / time_spend
             num_str = f"{self.current} / {self.total}"
-            percent_str = f"({self.current/self.total:.2%})"
+            percent_str = f"({self.current * self._inv_total:.2%})"
             time_str = f"[{fmt_time(time_spend)} / {fmt_time(time_left)}, {speed:.2f} update/s]"
             self.logger.info(f"{self.desc}: {num_str} {percent_str} {time_str}")
         else:
@@ -91,6 +96,12 @@ class Register(Generic[RegistedType]):
         self.allow_load_from_repo = allow_load_from_repo
         self._items = {}
         self._shortcuts = {}
+        # merged mapping from every alias (main + short names) to the item
+        # dict, so lookups cost a single dict probe
+        self._all = {}
+        # generated config classes, keyed by the `make_config` arguments and
+        # the registered items at generation time
+        self._config_cache = {}
         return
 
     def __call__(self, *short_names: str, config_class=None):
@@ -114,14 +125,17 @@ class Register(Generic[RegistedType]):
                 assert name not in self._shortcuts, f"Name Conflict {name}"
 
             # register the item
-            self._items[main_name] = {
+            entry = {
                 "item": item,
                 "main_name": main_name,
                 "short_names": short_names,
                 "config_class": config_class,
             }
+            self._items[main_name] = entry
+            self._all[main_name] = entry
             for name in short_names:
                 self._shortcuts[name] = main_name
+                self._all[name] = entry
             return item
 
         return registe_item
@@ -145,9 +159,7 @@ class Register(Generic[RegistedType]):
         return list(self._shortcuts.keys())
 
     def __getitem__(self, key: str) -> dict:
-        if key not in self._items:
-            key = self._shortcuts[key]
-        return self._items[key]
+        return self._all[key]
 
     def get(self, key: str, default=None) -> dict:
         """Get the item dict by name.
@@ -159,11 +171,7 @@ class Register(Generic[RegistedType]):
         :return: The item dict containing the item, main_name, short_names, and config_class.
         :rtype: dict
         """
-        if key not in self._items:
-            if key not in self._shortcuts:
-                return default
-            key = self._shortcuts[key]
-        return self._items[key]
+        return self._all.get(key, default)
 
     def get_item(self, key: str):
         """Get the item by name.
@@ -173,9 +181,7 @@ class Register(Generic[RegistedType]):
         :return: The item.
         :rtype: Any
         """
-        if key not in self._items:
-            key = self._shortcuts[key]
-        return self._items[key]["item"]
+        return self._all[key]["item"]
 
     def make_config(
         self,
@@ -194,6 +200,11 @@ class Register(Generic[RegistedType]):
         :return: The config class.
         :rtype: dataclass
         """
+        # `make_dataclass` compiles a new class on every call; reuse the
+        # generated class as long as the registered items are unchanged
+        cache_key = (allow_multiple, default, config_name, tuple(self._items))
+        if cache_key in self._config_cache:
+            return self._config_cache[cache_key]
         choice_name = f"{self.name}_type"
         config_name = f"{self.name}_config" if config_name is None else config_name
         if allow_multiple:
@@ -226,6 +237,7 @@ class Register(Generic[RegistedType]):
                 docstring += f":param {self[name]['short_names'][0]}_config: The config for {name}.\n"
                 docstring += f":type {self[name]['short_names'][0]}_config: {self[name]['config_class'].__name__}\n"
         generated_config.__doc__ = docstring
+        self._config_cache[cache_key] = generated_config
         return generated_config
 
     def load(
@@ -247,6 +259,10 @@ class Register(Generic[RegistedType]):
         def load_item(type_str: str) -> RegistedType:
             # Try to load the item from the HuggingFace Hub First
             if self.allow_load_from_repo:
+                # deferred so that importing flexrag.utils does not pull in
+                # the huggingface_hub dependency graph
+                from huggingface_hub import HfApi
+
                 client = HfApi(
                     endpoint=os.environ.get("HF_ENDPOINT", None),
                     token=os.environ.get("HF_TOKEN", None),
@@ -308,7 +324,7 @@ class Register(Generic[RegistedType]):
         return len(self._items)
 
     def __contains__(self, key: str) -> bool:
-        return key in self.names
+        return key in self._all
 
     def __str__(self) -> str:
         data = {
@@ -331,6 +347,7 @@ class Register(Generic[RegistedType]):
         new_register = Register()
         new_register._items = {**self._items, **register._items}
         new_register._shortcuts = {**self._shortcuts, **register._shortcuts}
+        new_register._all = {**self._all, **register._all}
         return new_register
 
 
@@ -368,7 +385,6 @@ def Choices(choices: Iterable[str]):
     return StrEnum("Choices", {c: c for c in choices})
 
 
-# Monkey Patching the JSONEncoder to handle StrEnum
 class _CustomEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, StrEnum):
@@ -390,14 +406,59 @@ class _CustomEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
-json.dumps = partial(json.dumps, cls=_CustomEncoder)
-json.dump = partial(json.dump, cls=_CustomEncoder)
+def json_dumps(obj, **kwargs) -> str:
+    """``json.dumps`` with support for FlexRAG-specific types
+    (StrEnum, DictConfig, numpy scalars, and objects with to_list/to_dict).
+
+    :param obj: The object to serialize.
+    :type obj: Any
+    :return: The serialized JSON string.
+    :rtype: str
+    """
+    kwargs.setdefault("cls", _CustomEncoder)
+    return json.dumps(obj, **kwargs)
+
+
+def json_dump(obj, fp, **kwargs) -> None:
+    """``json.dump`` with support for FlexRAG-specific types
+    (StrEnum, DictConfig, numpy scalars, and objects with to_list/to_dict).
+
+    :param obj: The object to serialize.
+    :type obj: Any
+    :param fp: The file-like object to write to.
+    :type fp: IO[str]
+    """
+    kwargs.setdefault("cls", _CustomEncoder)
+    return json.dump(obj, fp, **kwargs)
 
 
 class _TimeMeter:
-    def __init__(self):
-        self._manager = Manager()
-        self.timers = self._manager.dict()
+    def __init__(self, shared: bool = False):
+        """Initialize the time meter.
+
+        :param shared: Whether the timers should be shared across processes.
+            The shared variant routes every recorded duration through a
+            ``multiprocessing.Manager`` proxy, which is far more expensive
+            than the in-process default, defaults to False.
+        :type shared: bool, optional
+        """
+        self._lock = threading.Lock()
+        if shared:
+            from multiprocessing import Manager
+
+            self._manager = Manager()
+            self.timers = self._manager.dict()
+        else:
+            self._manager = None
+            self.timers = defaultdict(list)
+        return
+
+    def _record(self, timer_names: tuple[str, ...], duration: float) -> None:
+        with self._lock:
+            if self._manager is not None:
+                if timer_names not in self.timers:
+                    self.timers[timer_names] = self._manager.list()
+            self.timers[timer_names].append(duration)
         return
 
     def __call__(self, *timer_names: str):
@@ -406,21 +467,21 @@ class _TimeMeter:
                 start_time = perf_counter()
                 result = func(*args, **kwargs)
                 end_time = perf_counter()
-                if timer_names not in self.timers:
-                    self.timers[timer_names] = self._manager.list()
-                self.timers[timer_names].append(end_time - start_time)
+                self._record(timer_names, end_time - start_time)
                 return result
 
             async def async_wrapper(*args, **kwargs):
                 start_time = perf_counter()
                 result = await func(*args, **kwargs)
                 end_time = perf_counter()
-                if timer_names not in self.timers:
-                    self.timers[timer_names] = self._manager.list()
-                self.timers[timer_names].append(end_time - start_time)
+                self._record(timer_names, end_time - start_time)
                 return result
 
-            if isinstance(func, Coroutine):
+            # `async def` functions are coroutine *functions*, not Coroutine
+            # instances, so an isinstance check would never select the
+            # async wrapper and the coroutine would be timed (and returned)
+            # without being awaited
+            if inspect.iscoroutinefunction(func):
                 return async_wrapper
             return wrapper
 
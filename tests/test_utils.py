@@ -0,0 +1,38 @@
+import asyncio
+import inspect
+from time import sleep
+
+from flexrag.utils import _TimeMeter
+
+
+class TestTimeMeter:
+    def test_time_sync_function(self):
+        meter = _TimeMeter()
+
+        @meter("sync_timer")
+        def work():
+            sleep(0.01)
+            return "done"
+
+        assert work() == "done"
+        durations = meter.details[("sync_timer",)]
+        assert len(durations) == 1
+        assert durations[0] >= 0.01
+
+    def test_time_async_function(self):
+        meter = _TimeMeter()
+
+        @meter("async_timer")
+        async def work():
+            await asyncio.sleep(0.01)
+            return "done"
+
+        # the decorated function must remain a coroutine function so that
+        # callers can still await it (or detect it with iscoroutinefunction)
+        assert inspect.iscoroutinefunction(work)
+        assert asyncio.run(work()) == "done"
+        # the recorded duration must cover the awaited sleep, not just the
+        # synchronous time it takes to build the coroutine object
+        durations = meter.details[("async_timer",)]
+        assert len(durations) == 1
+        assert durations[0] >= 0.01